@@ -1,5 +1,8 @@
 import pygame
 
+from assets import Assets
+from resolution import Resolution
+
 
 class Animation:
     def __init__(self, images: list[pygame.Surface], animation_speed: float, repeating: bool = True) -> None:
@@ -18,12 +21,15 @@ class Animation:
 
         return self.images[int(self.index)]
 
-    def draw_next(self, screen: pygame.Surface, position: pygame.Vector2) -> None:
+    def draw_next(self, screen: pygame.Surface, position: pygame.Vector2) -> pygame.Rect | None:
         image: pygame.Surface | None = self.next()
 
-        if image is not None:
-            rect: pygame.Rect = image.get_rect(center=position)
-            screen.blit(image, rect)
+        if image is None:
+            return None
+        scale: float = Resolution.scale_of(screen)
+        image = Resolution.scaled(image, scale)
+        rect: pygame.Rect = image.get_rect(center=Resolution.point(position, scale))
+        return screen.blit(image, rect)
 
     def reset(self) -> None:
         self.index = 0
@@ -31,13 +37,6 @@ class Animation:
     @staticmethod
     def import_spritesheet(file_path: str, width: int, height: int,
                            animation_speed: float, repeating: bool = True) -> "Animation":
-        sprite_sheet: pygame.Surface = pygame.image.load(file_path).convert_alpha()
-
-        images: list[pygame.Surface] = []
-        for i in range(sprite_sheet.get_width() // width):
-            current_image: pygame.Surface = pygame.Surface((width, height), pygame.SRCALPHA, 32)
-            source_rect: pygame.Rect = pygame.Rect(i * width, 0, width, height)
-            current_image.blit(sprite_sheet, (0, 0), source_rect)
-            images.append(current_image)
+        images: list[pygame.Surface] = Assets().frames(file_path, width, height)
 
         return Animation(images, animation_speed, repeating)
@@ -0,0 +1,110 @@
+import json
+import mmap
+import os
+import struct
+from typing import Any
+
+import pygame
+
+
+class AssetPack:
+    magic: bytes = b"GSPK"
+    version: int = 1
+    header: struct.Struct = struct.Struct("<4sII")  # magic, verzió, index hossza
+    alignment: int = 16
+    default_path: str = "assets.pack"
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+
+        with open(path, "rb") as file:
+            # a mmap a fájl bezárása után is érvényes marad
+            self.data: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, index_length = AssetPack.header.unpack_from(self.data, 0)
+        if magic != AssetPack.magic or version != AssetPack.version:
+            self.data.close()
+            raise ValueError(f"{path} is not a version {AssetPack.version} asset pack")
+
+        self.view: memoryview = memoryview(self.data)
+        index_start: int = AssetPack.header.size
+        self.index: dict[str, dict[str, Any]] = json.loads(bytes(self.view[index_start:index_start + index_length]))
+        self.data_start: int = AssetPack.align(index_start + index_length)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.index
+
+    def blob(self, path: str) -> memoryview:
+        entry: dict[str, Any] = self.index[path]
+        start: int = self.data_start + entry["offset"]
+        return self.view[start:start + entry["length"]]
+
+    def image(self, path: str) -> pygame.Surface:
+        return pygame.image.frombuffer(self.blob(path), tuple(self.index[path]["size"]), "RGBA")
+
+    def sound(self, path: str) -> pygame.mixer.Sound | None:
+        # az előre dekódolt PCM csak ugyanazzal a mixer beállítással használható
+        if tuple(self.index[path]["mixer"]) != pygame.mixer.get_init():
+            return None
+        return pygame.mixer.Sound(buffer=self.blob(path))
+
+    def file(self, path: str) -> bytes:
+        return bytes(self.blob(path))
+
+    @staticmethod
+    def open(path: str = default_path) -> "AssetPack | None":
+        if not os.path.exists(path):
+            return None
+
+        try:
+            return AssetPack(path)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    @staticmethod
+    def align(offset: int) -> int:
+        return (offset + AssetPack.alignment - 1) // AssetPack.alignment * AssetPack.alignment
+
+    @staticmethod
+    def build(output: str, manifest: list[tuple[str, str]]) -> int:
+        if pygame.mixer.get_init() is None:
+            pygame.mixer.init()
+        mixer: tuple[int, int, int] = pygame.mixer.get_init()
+
+        index: dict[str, dict[str, Any]] = {}
+        blobs: list[bytes] = []
+        offset: int = 0
+
+        for path, kind in manifest:
+            entry: dict[str, Any] = {"kind": kind}
+            if kind == "image":
+                surface: pygame.Surface = pygame.image.load(path)
+                entry["size"] = surface.get_size()
+                blob: bytes = pygame.image.tobytes(surface, "RGBA")
+            elif kind == "sound":
+                entry["mixer"] = mixer
+                blob = pygame.mixer.Sound(path).get_raw()
+            else:
+                with open(path, "rb") as file:
+                    blob = file.read()
+
+            entry["offset"] = offset
+            entry["length"] = len(blob)
+            index[path] = entry
+
+            padding: int = AssetPack.align(len(blob)) - len(blob)
+            blobs.append(blob + bytes(padding))
+            offset += len(blob) + padding
+
+        index_bytes: bytes = json.dumps(index).encode("utf-8")
+        header: bytes = AssetPack.header.pack(AssetPack.magic, AssetPack.version, len(index_bytes))
+        index_padding: int = AssetPack.align(len(header) + len(index_bytes)) - len(header) - len(index_bytes)
+
+        with open(output, "wb") as file:
+            file.write(header)
+            file.write(index_bytes)
+            file.write(bytes(index_padding))
+            for blob in blobs:
+                file.write(blob)
+
+        return len(index)
@@ -0,0 +1,320 @@
+import io
+import os
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from concurrent.futures import Executor, Future
+from typing import Any
+
+import pygame
+
+from assetpack import AssetPack
+from audiocache import AudioCache
+from memory import SurfaceTracker
+
+Asset = pygame.Surface | list[pygame.Surface] | pygame.font.Font | pygame.mixer.Sound
+DemotedSurface = tuple[bytes, tuple[int, int], bool]  # tömörített pixelek, méret, van-e alfa
+
+
+class Assets(object):
+    _instance: Any = None
+    _initialized: bool = False
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "Assets":
+        if cls._instance is None:
+            cls._instance = super(Assets, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if self._initialized:
+            return
+        self._initialized = True
+
+        self.cache: OrderedDict[Hashable, Asset] = OrderedDict()
+        self.max_bytes: int | None = None  # None = nincs felső korlát
+        self.size_bytes: int = 0
+
+        # a jelenetváltáskor félretett felületek tömörítve, a cache-en kívül
+        self.demoted: dict[Hashable, DemotedSurface] = {}
+        # tömörítés alatt álló felületek; a kész bájtokig a felület él, így addig is azonnal visszaadható
+        self.demoting: dict[Hashable, tuple[Future[bytes], pygame.Surface]] = {}
+
+        # ha van lefordított asset pack, abból töltünk, egyébként a különálló fájlokból
+        self.pack: AssetPack | None = AssetPack.open()
+
+        # előtöltött fontfájlok tartalma, ebből készülnek a különböző méretű fontok
+        self.font_files: dict[str, bytes] = {}
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    @property
+    def stats(self) -> dict[str, int | None]:
+        return {
+            "entries": len(self.cache),
+            "bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "demoted": len(self.demoted),
+            "demoting": len(self.demoting),
+            "demoted_bytes": sum(len(entry[0]) for entry in self.demoted.values()),
+        }
+
+    def get(self, key: Hashable, factory: Callable[[], Asset]) -> Asset:
+        asset: Asset | None = self.cache.get(key)
+        if asset is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return asset
+
+        self.misses += 1
+        asset = self.take_demoted(key)
+        if asset is None:
+            asset = factory()
+        Assets.track(key, asset)
+        self.cache[key] = asset
+        self.size_bytes += Assets.byte_size(asset)
+        self.evict()
+
+        return asset
+
+    def evict(self) -> None:
+        if self.max_bytes is None:
+            return
+
+        # a legutóbb betöltött elem mindig bent marad
+        while self.size_bytes > self.max_bytes and len(self.cache) > 1:
+            _, asset = self.cache.popitem(last=False)
+            self.size_bytes -= Assets.byte_size(asset)
+            self.evictions += 1
+
+    def set_max_bytes(self, max_bytes: int | None) -> None:
+        self.max_bytes = max_bytes
+        self.evict()
+
+    def clear(self) -> None:
+        self.cache.clear()
+        self.demoted.clear()
+        self.demoting.clear()
+        self.size_bytes = 0
+
+    def load(self, key: Hashable) -> Asset:
+        # a kulcs első eleme a betöltő metódus neve, a többi a paraméterei
+        return getattr(self, key[0])(*key[1:])  # type: ignore
+
+    def demote(self, key: Hashable, executor: Executor | None = None) -> None:
+        asset: Asset | None = self.cache.get(key)
+        if not isinstance(asset, pygame.Surface):
+            return
+
+        del self.cache[key]
+        self.size_bytes -= Assets.byte_size(asset)
+        if executor is None:
+            self.demoted[key] = (Assets.compress(asset), asset.get_size(), Assets.has_alpha(asset))
+        else:
+            # a jelenetváltás ne várja meg a tömörítést
+            self.demoting[key] = (executor.submit(Assets.compress, asset), asset)
+
+    def demote_paths(self, paths: set[str], executor: Executor | None = None) -> None:
+        for key in list(self.cache.keys()):
+            if isinstance(key, tuple) and len(key) > 1 and key[1] in paths:  # type: ignore
+                self.demote(key, executor)
+
+    def finish_demotions(self) -> None:
+        for key, (future, surface) in list(self.demoting.items()):
+            if future.done():
+                del self.demoting[key]
+                self.demoted[key] = (future.result(), surface.get_size(), Assets.has_alpha(surface))
+
+    def take_demoted(self, key: Hashable) -> pygame.Surface | None:
+        pending: tuple[Future[bytes], pygame.Surface] | None = self.demoting.pop(key, None)
+        if pending is not None:
+            pending[0].cancel()
+            return pending[1]
+        demoted: DemotedSurface | None = self.demoted.pop(key, None)
+        return Assets.inflate(demoted) if demoted is not None else None
+
+    def discard(self, key: Hashable) -> None:
+        asset: Asset | None = self.cache.pop(key, None)
+        if asset is not None:
+            self.size_bytes -= Assets.byte_size(asset)
+        self.demoted.pop(key, None)
+        self.demoting.pop(key, None)
+
+    def restore(self, key: Hashable, pixels: bytes) -> None:
+        demoted: DemotedSurface | None = self.demoted.pop(key, None)
+        if demoted is None or key in self.cache:
+            return
+
+        self.get(key, lambda: Assets.from_pixels(pixels, demoted[1], demoted[2]))
+
+    @staticmethod
+    def track(key: Hashable, asset: Asset) -> None:
+        if not isinstance(key, tuple) or len(key) < 2 or not isinstance(key[1], str):  # type: ignore
+            return
+
+        kind: str = key[0]  # type: ignore
+        path: str = key[1]  # type: ignore
+        label: str = f"{kind}:{path}"
+
+        if isinstance(asset, list):
+            for surface in asset:
+                SurfaceTracker.track(surface, "animation", label)
+        elif isinstance(asset, pygame.Surface):
+            if path.startswith("img/background/"):
+                category: str = "background"
+            elif path.startswith(("img/upgrades/", "img/how to play elements/")):
+                category = "ui"
+            else:
+                category = "sprite"
+            SurfaceTracker.track(asset, category, label)
+
+    @staticmethod
+    def has_alpha(surface: pygame.Surface) -> bool:
+        return surface.get_flags() & pygame.SRCALPHA != 0
+
+    @staticmethod
+    def compress(surface: pygame.Surface) -> bytes:
+        pixels: bytes = pygame.image.tobytes(surface, "RGBA" if Assets.has_alpha(surface) else "RGB")
+        return zlib.compress(pixels, 1)
+
+    @staticmethod
+    def inflate(demoted: DemotedSurface) -> pygame.Surface:
+        return Assets.from_pixels(zlib.decompress(demoted[0]), demoted[1], demoted[2])
+
+    @staticmethod
+    def from_pixels(pixels: bytes, size: tuple[int, int], alpha: bool) -> pygame.Surface:
+        surface: pygame.Surface = pygame.image.frombytes(pixels, size, "RGBA" if alpha else "RGB")
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def decode_image(self, path: str) -> pygame.Surface:
+        if self.pack is not None and path in self.pack:
+            return self.pack.image(path)
+        return pygame.image.load(path)
+
+    def decode(self, path: str, kind: str) -> pygame.Surface | pygame.mixer.Sound | bytes:
+        if kind == "image":
+            return self.decode_image(path)
+
+        if self.pack is not None and path in self.pack:
+            if kind == "sound":
+                sound: pygame.mixer.Sound | None = self.pack.sound(path)
+                if sound is not None:
+                    return sound
+            else:
+                return self.pack.file(path)
+
+        if kind == "sound":
+            return AudioCache.load(path)
+
+        with open(path, "rb") as file:
+            return file.read()
+
+    def add_decoded(self, path: str, kind: str, data: pygame.Surface | pygame.mixer.Sound | bytes | None) -> None:
+        path = Assets.normalize(path)
+        if data is None:
+            return
+
+        if kind == "image":
+            self.get(("image", path, True), lambda: data.convert_alpha())  # type: ignore
+        elif kind == "font":
+            self.font_files[path] = data  # type: ignore
+        elif kind == "sound":
+            self.get(("sound", path), lambda: data)  # type: ignore
+
+    def image(self, path: str, alpha: bool = True) -> pygame.Surface:
+        path = Assets.normalize(path)
+
+        def load() -> pygame.Surface:
+            preloaded: Hashable = ("image", path, True)
+            cached: Asset | None = self.cache.get(preloaded)
+            surface: pygame.Surface | None = cached if isinstance(cached, pygame.Surface) else None
+            if not alpha:
+                # az átlátszatlan változat mellett az előtöltött alfás példányt nem tartjuk meg
+                if surface is None:
+                    surface = self.take_demoted(preloaded)
+                self.discard(preloaded)
+            if surface is None:
+                surface = self.decode_image(path)
+            return surface.convert_alpha() if alpha else surface.convert()
+
+        return self.get(("image", path, alpha), load)  # type: ignore
+
+    def scaled(self, path: str, size: tuple[int, int], alpha: bool = True) -> pygame.Surface:
+        path = Assets.normalize(path)
+        return self.get(("scaled", path, size, alpha),  # type: ignore
+                        lambda: pygame.transform.scale(self.image(path, alpha), size))
+
+    def scaled_by(self, path: str, factor: float, alpha: bool = True) -> pygame.Surface:
+        path = Assets.normalize(path)
+        return self.get(("scaled_by", path, factor, alpha),  # type: ignore
+                        lambda: pygame.transform.scale_by(self.image(path, alpha), (factor, factor)))
+
+    def rotozoomed(self, path: str, angle: float, scale: float, alpha: bool = True) -> pygame.Surface:
+        path = Assets.normalize(path)
+        return self.get(("rotozoomed", path, angle, scale, alpha),  # type: ignore
+                        lambda: pygame.transform.rotozoom(self.image(path, alpha), angle, scale))
+
+    def frames(self, path: str, width: int, height: int) -> list[pygame.Surface]:
+        path = Assets.normalize(path)
+
+        def slice_sheet() -> list[pygame.Surface]:
+            sprite_sheet: pygame.Surface = self.image(path)
+
+            images: list[pygame.Surface] = []
+            for i in range(sprite_sheet.get_width() // width):
+                current_image: pygame.Surface = pygame.Surface((width, height), pygame.SRCALPHA, 32)
+                source_rect: pygame.Rect = pygame.Rect(i * width, 0, width, height)
+                current_image.blit(sprite_sheet, (0, 0), source_rect)
+                images.append(current_image)
+            return images
+
+        return self.get(("frames", path, width, height), slice_sheet)  # type: ignore
+
+    def font(self, path: str | None, size: int) -> pygame.font.Font:
+        if path is not None:
+            path = Assets.normalize(path)
+
+        def load() -> pygame.font.Font:
+            if not pygame.font.get_init():
+                pygame.font.init()
+
+            data: bytes | None = None
+            if path is not None:
+                data = self.font_files.get(path)
+                if data is None and self.pack is not None and path in self.pack:
+                    data = self.pack.file(path)
+            return pygame.font.Font(io.BytesIO(data) if data is not None else path, size)
+
+        return self.get(("font", path, size), load)  # type: ignore
+
+    def sound(self, path: str) -> pygame.mixer.Sound:
+        path = Assets.normalize(path)
+        return self.get(("sound", path), lambda: self.decode(path, "sound"))  # type: ignore
+
+    def music(self, path: str) -> str | io.BytesIO:
+        path = Assets.normalize(path)
+        if self.pack is not None and path in self.pack:
+            return io.BytesIO(self.pack.file(path))
+        return path
+
+    @staticmethod
+    def normalize(path: str) -> str:
+        return os.path.normpath(path).replace(os.sep, "/")
+
+    @staticmethod
+    def byte_size(asset: Asset) -> int:
+        if isinstance(asset, list):
+            return sum(Assets.byte_size(surface) for surface in asset)
+        if isinstance(asset, pygame.font.Font):
+            return 0
+        if isinstance(asset, pygame.mixer.Sound):
+            mixer: tuple[int, int, int] | None = pygame.mixer.get_init()
+            if mixer is None:
+                return 0
+            frequency, size, channels = mixer
+            return int(asset.get_length() * frequency) * channels * abs(size) // 8
+        return asset.get_pitch() * asset.get_height()
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import re
+import tempfile
+
+import pygame
+
+
+class AudioCache:
+    directory: str = ".cache/audio"
+    keys: dict[str, str] = {}
+
+    @staticmethod
+    def key(path: str) -> str:
+        mixer: tuple[int, int, int] | None = pygame.mixer.get_init()
+        if mixer is None:
+            raise pygame.error("mixer not initialized")
+
+        source_hash: str | None = AudioCache.keys.get(path)
+        if source_hash is None:
+            with open(path, "rb") as file:
+                source_hash = hashlib.sha1(file.read()).hexdigest()
+            AudioCache.keys[path] = source_hash
+
+        frequency, size, channels = mixer
+        return f"{AudioCache.prefix(path)}{source_hash}-{frequency}-{size}-{channels}"
+
+    @staticmethod
+    def prefix(path: str) -> str:
+        return os.path.splitext(path)[0].replace("/", "_").replace("\\", "_") + "-"
+
+    @staticmethod
+    def cache_path(path: str) -> str:
+        return os.path.join(AudioCache.directory, AudioCache.key(path) + ".pcm")
+
+    @staticmethod
+    def prepare(path: str) -> str:
+        cache_path: str = AudioCache.cache_path(path)
+        if not os.path.exists(cache_path):
+            AudioCache.store(path, cache_path, pygame.mixer.Sound(path))
+        return cache_path
+
+    @staticmethod
+    def load(path: str) -> pygame.mixer.Sound:
+        cache_path: str = AudioCache.cache_path(path)
+
+        try:
+            with open(cache_path, "rb") as file:
+                return pygame.mixer.Sound(buffer=file.read())
+        except FileNotFoundError:
+            pass
+
+        sound: pygame.mixer.Sound = pygame.mixer.Sound(path)
+        AudioCache.store(path, cache_path, sound)
+        return sound
+
+    @staticmethod
+    def stale_pattern(path: str) -> "re.Pattern[str]":
+        # csak ennek a hangnak a teljes nevű bejegyzései, egy "<név>-" kezdetű másik hangé nem
+        return re.compile(re.escape(AudioCache.prefix(path)) + r"[0-9a-f]{40}-\d+--?\d+-\d+\.pcm")
+
+    @staticmethod
+    def store(path: str, cache_path: str, sound: pygame.mixer.Sound) -> None:
+        try:
+            os.makedirs(AudioCache.directory, exist_ok=True)
+
+            # a régi (más forrásból vagy más mixer beállítással készült) bejegyzések törlése; a most írandó
+            # bejegyzést és a félkész (.tmp) fájlokat egy párhuzamos írás is használhatja, azokhoz nem nyúlunk
+            stale: re.Pattern[str] = AudioCache.stale_pattern(path)
+            current: str = os.path.basename(cache_path)
+            for name in os.listdir(AudioCache.directory):
+                if name != current and stale.fullmatch(name):
+                    try:
+                        os.remove(os.path.join(AudioCache.directory, name))
+                    except FileNotFoundError:
+                        pass
+
+            # a háttérszál és a fő szál egyszerre is írhatja ugyanazt, ezért írásonként egyedi ideiglenes fájl
+            handle, temporary_path = tempfile.mkstemp(suffix=".tmp", dir=AudioCache.directory)
+            try:
+                with os.fdopen(handle, "wb") as temporary:
+                    temporary.write(sound.get_raw())
+                os.replace(temporary_path, cache_path)
+            except OSError:
+                os.remove(temporary_path)
+                raise
+        except OSError:
+            # ha nem írható a cache, a hang attól még működik
+            pass
@@ -0,0 +1,692 @@
+import argparse
+import functools
+import math
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+
+import numpy as np
+import numpy.typing as npt
+import pygame
+
+from assets import Assets
+from audiocache import AudioCache
+from capture import FrameCapture
+from collision import Collision
+from debris import Debris
+from dirtyrect import DirtyRenderer
+from entitystore import Entity, EntityStore
+from grabber import ExtensionStage
+from laser import Laser
+from maskcache import MaskCache
+from meteorite import Meteorite
+from particles import Particles
+from player import Player, ShipGeometry
+from resolution import Resolution
+from renderqueue import RenderLayer, RenderQueue
+from rotation import RotationCache
+from sound import LazySound, Sound
+from broadphase import Broadphase
+from starfield import Starfield
+
+
+def measure(function: Callable[[], object], repeat: int) -> float:
+    timings: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def print_table(header: tuple[str, ...], rows: list[tuple[object, ...]]) -> None:
+    widths: list[int] = [max(len(str(row[i])) for row in [header, *rows]) for i in range(len(header))]
+    for row in [header, *rows]:
+        print("  ".join(str(cell).rjust(width) for cell, width in zip(row, widths)))
+
+
+def init_display() -> pygame.Surface:
+    pygame.display.init()
+    return pygame.display.set_mode((1600, 900))
+
+
+def spawn_meteorites(count: int, screen_resolution: tuple[int, int]) -> list[Meteorite]:
+    random.seed(count)
+    meteorites: list[Meteorite] = []
+    for _ in range(count):
+        position: pygame.Vector2 = pygame.Vector2(random.uniform(0, screen_resolution[0]),
+                                                  random.uniform(0, screen_resolution[1]))
+        meteorite: Meteorite = Meteorite(position, random.uniform(0, 360), random.random() * 2 + 1,
+                                         random.randrange(50, 140))
+        meteorite.rotation = random.uniform(0, 360)
+        meteorites.append(meteorite)
+    return meteorites
+
+
+# a tárolók és a renderelési sor előtti, példányonkénti út, az összehasonlítások alapja
+def rotate_one_by_one(entities: Sequence[Entity]) -> None:
+    for entity in entities:
+        entity.rotation = (entity.rotation + entity.rotation_speed) % 360
+
+
+def draw_one_by_one(screen: pygame.Surface, entities: Sequence[Entity]) -> list[pygame.Rect]:
+    scale: float = Resolution.scale_of(screen)
+    rects: list[pygame.Rect] = []
+    for entity in entities:
+        position: pygame.Vector2 = entity.position
+        rotated_image, offset = RotationCache.get(entity.image, entity.rotation, scale)
+        rects.append(screen.blit(rotated_image, (position.x * scale + offset[0], position.y * scale + offset[1])))
+    return rects
+
+
+def benchmark_audio(args: argparse.Namespace) -> None:
+    pygame.mixer.init()
+    paths: list[str] = [sound.path for sound in Sound().all_sound]
+
+    with tempfile.TemporaryDirectory() as directory:
+        AudioCache.directory = directory
+        # a pack most kikerülendő, hogy tényleg a cache-t mérjük
+        Assets().pack = None
+
+        timings: list[tuple[float, float, float]] = []
+        for path in paths:
+            cold: float = measure(lambda: pygame.mixer.Sound(path), args.repeat)
+            AudioCache.prepare(path)
+            warm: float = measure(lambda: AudioCache.load(path), args.repeat)
+
+            def first_play() -> None:
+                Assets().clear()
+                LazySound(path).play()
+
+            lazy: float = measure(first_play, args.repeat)
+            timings.append((cold, warm, lazy))
+
+    totals: list[float] = [sum(column) for column in zip(*timings)]
+    rows: list[tuple[object, ...]] = [(path, *(f"{timing:.2f}" for timing in row)) for path, row in zip(paths, timings)]
+    rows.append(("total", *(f"{total:.2f}" for total in totals)))
+
+    print_table(("file", "cold decode ms", "warm cache ms", "lazy first play ms"), rows)
+
+    Sound._instance = None
+    print(f"Sound() construction: {measure(Sound, 1):.2f} ms")
+
+
+def benchmark_rotation(args: argparse.Namespace) -> None:
+    screen: pygame.Surface = init_display()
+    rows: list[tuple[object, ...]] = []
+
+    for count in (50, 200, 1000):
+        timings: list[float] = []
+        for enabled in (False, True):
+            RotationCache.enabled = enabled
+            RotationCache.clear()
+            meteorites: list[Meteorite] = spawn_meteorites(count, screen.get_size())
+
+            def frame() -> None:
+                rotate_one_by_one(meteorites)
+                draw_one_by_one(screen, meteorites)
+
+            # az első képkockák töltik fel a cache-t, azokat nem mérjük
+            for _ in range(args.warmup):
+                frame()
+            timings.append(measure(frame, args.frames) * 1000 / count)
+
+        rows.append((count, f"{timings[0]:.1f}", f"{timings[1]:.1f}", f"{timings[0] / timings[1]:.1f}x",
+                     f"{RotationCache.size_bytes / 2 ** 20:.0f}"))
+
+    print(f"rotation step {RotationCache.step} deg, cache cap {RotationCache.max_bytes / 2 ** 20:.0f} MiB")
+    print_table(("meteorites", "cache off us/entity", "cache on us/entity", "speedup", "cache MiB"), rows)
+
+
+def draw_layered_laser(laser: Laser, screen: pygame.Surface) -> None:
+    # a sütés előtti rajzolás: rétegenként egy új SRCALPHA felület
+    for vertical in (False, True):
+        size: int = Laser.beam_width
+        position: int = laser.pos_ver[0] if vertical else laser.pos[1]
+        for color in laser.colors[laser.random_color][::-1]:
+            surface: pygame.Surface = pygame.Surface((size, 900) if vertical else (1600, size), pygame.SRCALPHA)
+            surface.fill((*color, Laser.layer_alpha))
+            screen.blit(surface, (position, 0) if vertical else (0, position))
+            position += Laser.layer_step
+            size -= 2 * Laser.layer_step
+
+
+def benchmark_laser(args: argparse.Namespace) -> None:
+    screen: pygame.Surface = init_display()
+    background: pygame.Surface = Assets().image("img/background/space.png", alpha=False)
+
+    laser: Laser = Laser((100, 300), screen)
+    laser.two_laser = True
+    laser.laser_go = True
+    laser.pos_ver = (700, 25)
+
+    rows: list[tuple[object, ...]] = []
+    for name, draw in (("layered", lambda: draw_layered_laser(laser, screen)), ("baked", lambda: laser.update(screen))):
+        def frame() -> None:
+            screen.blit(background, (0, 0))
+            draw()
+
+        for _ in range(args.warmup):
+            frame()
+        rows.append((name, f"{measure(frame, args.frames):.3f}", f"{measure(draw, args.frames):.3f}"))
+
+    print_table(("beams", "frame ms", "lasers only ms"), rows)
+
+
+def benchmark_dirty(args: argparse.Namespace) -> None:
+    screen: pygame.Surface = init_display()
+    background: pygame.Surface = Assets().image("img/background/space.png", alpha=False)
+    rows: list[tuple[object, ...]] = []
+
+    for count in (3, 8, 20, 60):
+        timings: list[float] = []
+        for enabled in (False, True):
+            renderer: DirtyRenderer = DirtyRenderer(screen, args.dirty_threshold, enabled)
+            Meteorite.meteorites.empty()
+            Debris.debris_group.empty()
+            Meteorite.meteorites.add(*spawn_meteorites(count, screen.get_size()))
+            random.seed(count)
+            for _ in range(count):
+                Debris.debris_group.add(Debris(pygame.Vector2(random.uniform(0, screen.get_width()),
+                                                              random.uniform(0, screen.get_height())),
+                                               random.uniform(0, 360), 0))
+
+            def frame() -> None:
+                renderer.begin(background)
+                sprites: list[Entity] = [*Meteorite.meteorites.sprites(), *Debris.debris_group.sprites()]
+                rotate_one_by_one(sprites)
+                renderer.add_all(draw_one_by_one(screen, sprites))
+                renderer.present()
+
+            for _ in range(args.warmup):
+                frame()
+            timings.append(measure(frame, args.frames))
+
+        rows.append((count, f"{timings[0]:.3f}", f"{timings[1]:.3f}", f"{timings[0] / timings[1]:.1f}x",
+                     f"{renderer.full_frames}/{renderer.frames}"))
+
+    print(f"{screen.get_width()}x{screen.get_height()}, video driver {pygame.display.get_driver()}, "
+          f"full redraw above {args.dirty_threshold:.0%} of the screen")
+    print_table(("meteorites + debris", "full ms/frame", "dirty ms/frame", "speedup", "full frames"), rows)
+
+
+def benchmark_scale(args: argparse.Namespace) -> None:
+    window: pygame.Surface = init_display()
+    Resolution.configure(window=window.get_size())
+    background: pygame.Surface = Assets().image("img/background/space.png", alpha=False)
+    rows: list[tuple[object, ...]] = []
+
+    for count in (10, 40):
+        for scale in (0.5, 0.75, 1.0):
+            Resolution.configure(scale=scale)
+            RotationCache.clear()
+            screen: pygame.Surface = window if Resolution.render_size() == Resolution.viewport.size \
+                else pygame.Surface(Resolution.render_size()).convert()
+            meteorites: list[Meteorite] = spawn_meteorites(count, Resolution.logical)
+
+            timings: list[float] = []
+            for enabled in (False, True):
+                renderer: DirtyRenderer = DirtyRenderer(screen, args.dirty_threshold, enabled)
+
+                def frame() -> None:
+                    renderer.begin(Resolution.scaled(background, scale))
+                    rotate_one_by_one(meteorites)
+                    renderer.add_all(draw_one_by_one(screen, meteorites))
+                    renderer.present()
+
+                for _ in range(args.warmup):
+                    frame()
+                timings.append(measure(frame, args.frames))
+
+            rows.append((count, f"{scale:g}", "x".join(map(str, Resolution.render_size())),
+                         f"{timings[0]:.3f}", f"{timings[1]:.3f}"))
+
+    print(f"window {window.get_width()}x{window.get_height()}, video driver {pygame.display.get_driver()}")
+    print_table(("meteorites", "scale", "render size", "full redraw ms/frame", "dirty rects ms/frame"), rows)
+
+
+def benchmark_queue(args: argparse.Namespace) -> None:
+    screen: pygame.Surface = init_display()
+    rows: list[tuple[object, ...]] = []
+
+    for count in (20, 100, 400):
+        # a fele a képernyőn kívül születik, ahogy a játékban is
+        meteorites: list[Meteorite] = spawn_meteorites(count // 2, screen.get_size())
+        random.seed(-count)
+        for _ in range(count - len(meteorites)):
+            radius: int = random.randrange(50, 140)
+            meteorites.append(Meteorite(Meteorite.generate_point_outside_screen(screen.get_size(), radius),
+                                        random.uniform(0, 360), 0, radius))
+        debris: list[Debris] = [Debris(pygame.Vector2(random.uniform(0, screen.get_width()),
+                                                      random.uniform(0, screen.get_height())), 0, 0)
+                                for _ in range(count)]
+        queue: RenderQueue = RenderQueue(screen)
+        # a tárolóban sem léptetjük őket, csak a forgatás változik, mint az egyenkénti úton
+        meteorite_store: EntityStore[Meteorite] = EntityStore()
+        meteorite_store.add(*meteorites)
+        debris_store: EntityStore[Debris] = EntityStore()
+        debris_store.add(*debris)
+
+        def immediate() -> None:
+            rotate_one_by_one([*meteorites, *debris])
+            draw_one_by_one(screen, [*meteorites, *debris])
+
+        def queued() -> None:
+            rotate_one_by_one([*meteorites, *debris])
+            meteorite_store.submit(queue, RenderLayer["METEORITE"])
+            debris_store.submit(queue, RenderLayer["DEBRIS"])
+            queue.flush()
+
+        timings: list[float] = []
+        for frame in (immediate, queued):
+            for _ in range(args.warmup):
+                frame()
+            timings.append(measure(frame, args.frames))
+
+        rows.append((f"{count} + {count}", f"{timings[0]:.3f}", f"{timings[1]:.3f}", f"{timings[0] / timings[1]:.1f}x",
+                     queue.report()))
+
+    print_table(("meteorites + debris", "immediate ms", "queued ms", "speedup", "queue counters"), rows)
+
+
+def benchmark_particles(args: argparse.Namespace) -> None:
+    screen: pygame.Surface = init_display()
+    background: pygame.Surface = Assets().image("img/background/space.png", alpha=False)
+    particles: Particles = Particles()
+    rows: list[tuple[object, ...]] = []
+
+    for target in (1000, 10000, 16384, 30000):
+        particles.clear()
+        particles.dropped = 0
+        random.seed(target)
+        # hosszú életű, lassú részecskék, hogy a mérés alatt végig ugyanannyi éljen
+        for _ in range(0, target, 500):
+            particles.emit((random.uniform(200, screen.get_width() - 200), random.uniform(200, screen.get_height() - 200)),
+                           500, (0, 0.5), (100000, 100000), Particles.explosion_colors)
+
+        def frame() -> None:
+            screen.blit(background, (0, 0))
+            particles.draw(screen)
+
+        update: float = measure(particles.update, args.frames)
+        draw: float = measure(frame, args.frames) - measure(lambda: screen.blit(background, (0, 0)), args.frames)
+        rows.append((target, particles.count, f"{update:.3f}", f"{draw:.3f}", f"{update + draw:.3f}", particles.dropped))
+
+    print(f"cap {Particles.capacity} particles, {Particles.size} px")
+    print_table(("requested", "live", "update ms", "draw ms", "total ms", "dropped"), rows)
+
+
+def benchmark_starfield(args: argparse.Namespace) -> None:
+    screen: pygame.Surface = init_display()
+    alpha_background: pygame.Surface = Assets().image("img/background/space.png")
+    starfield: Starfield = Starfield(screen)
+    background: pygame.Surface = starfield.base(Assets().image("img/background/space.png", alpha=False))
+    velocity: pygame.Vector2 = pygame.Vector2(2, -1)
+
+    def alpha_frame() -> None:
+        screen.blit(alpha_background, (0, 0))
+        pygame.display.update()
+
+    def starfield_frame(renderer: DirtyRenderer) -> None:
+        renderer.begin(background)
+        starfield.update(velocity)
+        renderer.add_overlay(starfield.draw(screen))
+        renderer.present()
+
+    rows: list[tuple[object, ...]] = []
+    baseline: float = 0
+    for name, frame in (("alpha space.png", alpha_frame),
+                        ("opaque base + stars, full redraw",
+                         functools.partial(starfield_frame, DirtyRenderer(screen, enabled=False))),
+                        ("opaque base + stars, dirty rects", functools.partial(starfield_frame, DirtyRenderer(screen)))):
+        for _ in range(args.warmup):
+            frame()
+        timing: float = measure(frame, args.frames)
+        baseline = baseline or timing
+        rows.append((name, f"{timing:.3f}", f"{baseline / timing:.1f}x", "yes" if timing <= baseline else "no"))
+
+    print(f"{len(starfield.position)} stars in {len(Starfield.layers)} layers, "
+          f"video driver {pygame.display.get_driver()}")
+    print_table(("background", "ms/frame", "speedup", "not slower"), rows)
+
+
+def benchmark_capture(args: argparse.Namespace) -> None:
+    screen: pygame.Surface = init_display()
+    background: pygame.Surface = Assets().image("img/background/space.png", alpha=False)
+    meteorites: list[Meteorite] = spawn_meteorites(20, screen.get_size())
+    rows: list[tuple[object, ...]] = []
+
+    for mode in FrameCapture.formats:
+        with tempfile.TemporaryDirectory() as directory:
+            capture: FrameCapture = FrameCapture(directory, mode)
+            capture.start(screen)
+            timings: list[float] = []
+            # valós ütemben, hogy a kódolónak annyi ideje legyen, mint játék közben
+            for frame in range(args.warmup + args.frames):
+                started: float = time.perf_counter()
+                screen.blit(background, (0, 0))
+                rotate_one_by_one(meteorites)
+                draw_one_by_one(screen, meteorites)
+                submitted: float = time.perf_counter()
+                capture.submit(screen)
+                if frame >= args.warmup:
+                    timings.append((time.perf_counter() - submitted) * 1000)
+                time.sleep(max(0.0, 1 / 60 - (time.perf_counter() - started)))
+            capture.stop()
+
+        timings.sort()
+        rows.append((mode, f"{statistics.median(timings):.3f}", f"{timings[int(len(timings) * 0.95)]:.3f}",
+                     capture.frames, capture.dropped))
+
+    print(f"{screen.get_width()}x{screen.get_height()}, ring of {FrameCapture.ring_size} frames, "
+          f"{args.warmup} warmup frames included in the counters")
+    print_table(("format", "median ms", "p95 ms", "frames", "dropped"), rows)
+
+
+def benchmark_prepare(args: argparse.Namespace) -> None:
+    screen: pygame.Surface = init_display()
+    background: pygame.Surface = Assets().image("img/background/space.png", alpha=False)
+    queue: RenderQueue = RenderQueue(screen)
+    cpus: int = os.cpu_count() or 1
+    worker_counts: list[int] = sorted({1, 2, 4, cpus} | {count for count in (8, 16) if count <= cpus})
+    rows: list[tuple[object, ...]] = []
+
+    for cached in (False, True):
+        # kikapcsolt cache-nél minden látható meteoritot minden képkockán forgatni kell
+        RotationCache.enabled = cached
+        meteorites: list[Meteorite] = spawn_meteorites(150, screen.get_size())
+        store: EntityStore[Meteorite] = EntityStore()
+        store.add(*meteorites)
+        baseline: float = 0
+        for workers in worker_counts:
+            RotationCache.configure(workers=workers)
+
+            def frame() -> None:
+                if cached:
+                    RotationCache.clear()
+                screen.blit(background, (0, 0))
+                rotate_one_by_one(meteorites)
+                store.submit(queue, RenderLayer["METEORITE"])
+                queue.flush()
+
+            for _ in range(args.warmup):
+                frame()
+            timing: float = measure(frame, args.frames)
+            baseline = baseline or timing
+            rows.append(("cold cache" if cached else "cache off", workers, f"{timing:.3f}",
+                         f"{baseline / timing:.2f}x"))
+
+    RotationCache.enabled = True
+    print(f"150 meteorites on a {screen.get_width()}x{screen.get_height()} screen, {cpus} CPUs")
+    print_table(("rotation cache", "workers", "ms/frame", "speedup"), rows)
+
+
+def benchmark_collision(args: argparse.Namespace) -> None:
+    init_display()
+    center: pygame.Vector2 = pygame.Vector2(800, 450)
+    player: Player = Player(int(center.x), int(center.y), 0)
+    rows: list[tuple[object, ...]] = []
+
+    for count in (50, 200, 800):
+        # a hajó körül sűrűn, hogy sok meteorit jusson át a befoglaló körös szűrésen
+        meteorites: list[Meteorite] = spawn_meteorites(count, (500, 500))
+        for meteorite in meteorites:
+            meteorite.position += center - pygame.Vector2(250, 250)
+        store: EntityStore[Meteorite] = EntityStore()
+        store.add(*meteorites)
+        assert player.image is not None
+        half_size: tuple[float, float] = (player.image.get_width() / 2, player.image.get_height() / 2)
+
+        timings: list[float] = []
+        hits: list[int] = []
+        for pixel_perfect in (False, True):
+            Collision.pixel_perfect = pixel_perfect
+            MaskCache.clear()
+
+            def frame() -> bool:
+                player.direction = (player.direction + 1) % 360
+                return player.check_collision(store)
+
+            def count_hits() -> int:
+                # a játék az első találatnál megáll; a találatok számát mérésen kívül, elemenként nézzük meg
+                if not pixel_perfect:
+                    return len(store.collide_obb(player.position, half_size, -player.direction))
+                candidates: list[Meteorite] = store.query_obb(player.position, half_size, -player.direction)
+                return sum(player.check_pixel_collision([meteorite]) for meteorite in candidates)
+
+            cold: float = measure(frame, 1)
+            for _ in range(args.warmup):
+                frame()
+            timings.append(measure(frame, args.frames))
+            hits.append(count_hits())
+            if pixel_perfect:
+                rows.append((count, f"{timings[0]:.3f}", f"{timings[1]:.3f}", f"{cold:.3f}", hits[0], hits[1]))
+
+    Collision.pixel_perfect = False
+    print(f"Player.check_collision against meteorites within 350 px (stops at the first hit), "
+          f"hits counted per meteorite, mask cache {len(MaskCache.cache)} entries")
+    print_table(("meteorites", "circle ms", "pixel ms", "pixel cold ms", "circle hits", "pixel hits"), rows)
+
+
+def benchmark_broadphase(args: argparse.Namespace) -> None:
+    init_display()
+    center: pygame.Vector2 = pygame.Vector2(Resolution.logical[0] / 2, Resolution.logical[1] / 2)
+    player: Player = Player(int(center.x), int(center.y), 0)
+    player.grabber.extension_stage = ExtensionStage["EXTENDING"]
+    player.grabber.length = player.grabber.max_length
+    rows: list[tuple[object, ...]] = []
+
+    def scatter(count: int) -> list[pygame.Vector2]:
+        # a képernyőn szétszórva, de a hajótól és a karomtól távol, hogy egyik mód se álljon meg találatnál
+        points: list[pygame.Vector2] = []
+        while len(points) < count:
+            point: pygame.Vector2 = pygame.Vector2(random.uniform(0, Resolution.logical[0]),
+                                                   random.uniform(0, Resolution.logical[1]))
+            if point.distance_to(center) > 450:
+                points.append(point)
+        return points
+
+    for count in (20, 50, 500, 2000):
+        random.seed(count)
+        meteorites: EntityStore[Meteorite] = EntityStore()
+        meteorites.add(*(Meteorite(point, 0, 0, random.randrange(50, 140)) for point in scatter(count)))
+        debris: EntityStore[Debris] = EntityStore()
+        debris.add(*(Debris(point, 0, 0) for point in scatter(count)))
+
+        timings: list[float] = []
+        for enabled in (False, True):
+            Broadphase.enabled = enabled
+            Broadphase.candidates = Broadphase.pairs = Broadphase.queries = 0
+
+            def frame() -> bool:
+                player.direction = (player.direction + 1) % 360
+                player.grabber.direction = player.direction
+                player.grabber.check_collect(debris)
+                return player.check_collision(meteorites)
+
+            for _ in range(args.warmup):
+                frame()
+            timings.append(measure(frame, args.frames))
+        rows.append((count, f"{timings[0]:.3f}", f"{timings[1]:.3f}", f"{timings[0] / timings[1]:.1f}x",
+                     Broadphase.report()))
+
+    Broadphase.enabled = True
+    print("ship and claw against meteorites and debris")
+    print_table(("entities each", "every entity ms", "bounding box ms", "speedup", "candidate pairs"), rows)
+
+
+def benchmark_narrowphase(args: argparse.Namespace) -> None:
+    init_display()
+    center: pygame.Vector2 = pygame.Vector2(800, 450)
+    player: Player = Player(int(center.x), int(center.y), 0)
+    assert player.image is not None
+    half_size: tuple[float, float] = (player.image.get_width() / 2, player.image.get_height() / 2)
+    rows: list[tuple[object, ...]] = []
+
+    for count in (10, 50, 200, 800):
+        # a hajó közvetlen közelében, mintha mind átjutott volna a rácson
+        random.seed(count)
+        centers: npt.NDArray[np.float64] = np.array(
+            [(center.x + random.uniform(-120, 120), center.y + random.uniform(-120, 120)) for _ in range(count)]
+        )
+        radii: npt.NDArray[np.float64] = np.array([random.uniform(40, 130) for _ in range(count)])
+        circles: list[tuple[pygame.Vector2, float]] = [(pygame.Vector2(*point), radius)
+                                                       for point, radius in zip(centers.tolist(), radii.tolist())]
+
+        def segment() -> list[bool]:
+            # a korábbi változat: a középpontokat összekötő szakasz metszése a téglalap oldalaival
+            verticies: list[pygame.Vector2] = player.get_verticies()
+            hits: list[bool] = []
+            for point, radius in circles:
+                closest: pygame.Vector2 | None = Collision.intersection_of_segment_rect(verticies, (center, point))
+                hits.append(closest is None or closest.distance_to(point) < radius)
+            return hits
+
+        def batched() -> npt.NDArray[np.bool_]:
+            return Collision.obb_circles_collision(center, half_size, -player.direction, centers, radii)
+
+        timings: list[float] = []
+        missed: int = 0
+        for function in (segment, batched):
+            player.direction = 0
+            for _ in range(args.warmup):
+                function()
+            timings.append(measure(function, args.frames))
+        for direction in range(0, 360, 15):
+            player.direction = direction
+            missed += sum(exact and not old for old, exact in zip(segment(), batched().tolist()))
+        rows.append((count, f"{timings[0]:.3f}", f"{timings[1]:.3f}", f"{timings[0] / timings[1]:.0f}x", missed))
+
+    print("ship against circles overlapping its bounding box, exact hits the segment method missed at 24 angles")
+    print_table(("circles", "segment ms", "batched ms", "speedup", "missed hits"), rows)
+
+
+def benchmark_geometry(args: argparse.Namespace) -> None:
+    init_display()
+    player: Player = Player(800, 450, 0)
+    assert player.image is not None
+    image: pygame.Surface = player.image
+    meteorites: int = 30  # a korábbi szűrés meteoritonként számolta újra a hajó köré írt kört
+    rows: list[tuple[object, ...]] = []
+
+    def old_verticies() -> list[pygame.Vector2]:
+        # a gyorsítótár előtti get_verticies, képkockánként kétszer hívva
+        width: int = image.get_width()
+        height: int = image.get_height()
+        verticies: list[pygame.Vector2] = []
+        for i in range(4):
+            binary: str = format(i, "b").zfill(2)
+            verticies.append(pygame.Vector2((width / 2) * (1 if binary[0] == "0" else -1),
+                                            (height / 2) * (1 if binary[1] == "0" else -1)).rotate(-player.direction)
+                             + player.position)
+        verticies[-1], verticies[-2] = verticies[-2], verticies[-1]
+        return verticies
+
+    def uncached() -> None:
+        old_verticies()
+        for _ in range(meteorites):
+            math.sqrt((image.get_width() / 2) ** 2 + (image.get_height() / 2) ** 2)
+        old_verticies()
+
+    def cached() -> None:
+        geometry: ShipGeometry = player.get_geometry()
+        for _ in range(meteorites):
+            geometry.bound
+        player.get_verticies()
+
+    for moving in (True, False):
+        timings: list[float] = []
+        for function in (uncached, cached):
+            def frame() -> None:
+                if moving:
+                    player.position.x += 0.5
+                    player.direction = (player.direction + 1) % 360
+                function()
+
+            player.geometry.rebuilds = 0
+            timings.append(measure(frame, args.frames * 10))
+        rows.append(("moving" if moving else "idle", f"{timings[0] * 1000:.1f}", f"{timings[1] * 1000:.1f}",
+                     f"{timings[0] / timings[1]:.1f}x", player.geometry.rebuilds))
+
+    print(f"ship geometry for one frame: two vertex lists and the bounding radius for {meteorites} meteorites")
+    print_table(("ship", "uncached us", "cached us", "speedup", "cache rebuilds"), rows)
+
+
+def benchmark_entities(args: argparse.Namespace) -> None:
+    init_display()
+    rows: list[tuple[object, ...]] = []
+
+    for count in (10, 100, 1000, 5000):
+        # lassú elemek a képernyő közepén, hogy a mérés alatt ne fogyjanak el
+        random.seed(count)
+        meteorites: list[Meteorite] = [
+            Meteorite(pygame.Vector2(random.uniform(600, 1000), random.uniform(300, 600)), random.uniform(0, 360),
+                      random.uniform(0, 0.5), random.randrange(50, 140))
+            for _ in range(count)
+        ]
+
+        def per_entity() -> None:
+            for meteorite in meteorites:
+                if meteorite.moving:
+                    meteorite.position = meteorite.position + meteorite.velocity_vector
+                meteorite.rotation = (meteorite.rotation + meteorite.rotation_speed) % 360
+                position: pygame.Vector2 = meteorite.position
+                if position.x < -meteorite.margin or position.x > Resolution.logical[0] + meteorite.margin or \
+                        position.y < -meteorite.margin or position.y > Resolution.logical[1] + meteorite.margin:
+                    meteorite.kill()
+
+        per_entity_ms: float = measure(per_entity, args.frames)
+
+        store: EntityStore[Meteorite] = EntityStore()
+        store.add(*meteorites)
+        store_ms: float = measure(store.update, args.frames)
+        rows.append((count, f"{per_entity_ms:.3f}", f"{store_ms:.3f}", f"{per_entity_ms / store_ms:.0f}x", len(store)))
+
+    print_table(("meteorites", "per entity ms", "store ms", "speedup", "alive after"), rows)
+
+
+BENCHMARKS: dict[str, Callable[[argparse.Namespace], None]] = {
+    "audio": benchmark_audio,
+    "broadphase": benchmark_broadphase,
+    "capture": benchmark_capture,
+    "collision": benchmark_collision,
+    "dirty": benchmark_dirty,
+    "entities": benchmark_entities,
+    "geometry": benchmark_geometry,
+    "particles": benchmark_particles,
+    "prepare": benchmark_prepare,
+    "queue": benchmark_queue,
+    "laser": benchmark_laser,
+    "narrowphase": benchmark_narrowphase,
+    "rotation": benchmark_rotation,
+    "scale": benchmark_scale,
+    "starfield": benchmark_starfield,
+}
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Galactic Salvage benchmarks")
+    parser.add_argument("benchmark", choices=BENCHMARKS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--frames", type=int, default=120, help="measured frames per scenario")
+    parser.add_argument("--warmup", type=int, default=30, help="unmeasured frames before each scenario")
+    parser.add_argument("--rotation-step", type=float, default=RotationCache.step)
+    parser.add_argument("--rotation-cache-mib", type=float, default=RotationCache.max_bytes / 2 ** 20)
+    parser.add_argument("--dirty-threshold", type=float, default=DirtyRenderer.default_threshold,
+                        help="screen fraction above which the dirty-rect renderer redraws everything")
+    parser.add_argument("--headless", action="store_true", help="use the dummy video and audio drivers")
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    RotationCache.configure(step=args.rotation_step, max_bytes=int(args.rotation_cache_mib * 2 ** 20))
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import numpy.typing as npt
+import pygame
+
+
+class Broadphase:
+    enabled: bool = True  # kikapcsolva minden lekérdezés az összes elemet adja, összehasonlításhoz
+
+    # az összes lekérdezés jelöltjei és a teljes párszám, amit szűrés nélkül meg kellett volna nézni
+    candidates: int = 0
+    pairs: int = 0
+    queries: int = 0
+
+    # a tároló élő elemeinek tömbjein dolgozunk, így nincs mit felépíteni vagy érvényteleníteni, ha mozognak
+    @staticmethod
+    def query_box(position: npt.NDArray[np.float64], radius: npt.NDArray[np.float64],
+                  left: float, top: float, right: float, bottom: float) -> npt.NDArray[np.intp]:
+        count: int = len(position)
+        Broadphase.queries += 1
+        Broadphase.pairs += count
+        if not Broadphase.enabled:
+            Broadphase.candidates += count
+            return np.arange(count)
+
+        # a körök befoglaló dobozát egyben vetjük össze a lekérdezéssel
+        overlapping: npt.NDArray[np.intp] = np.flatnonzero(
+            (position[:, 0] + radius >= left) & (position[:, 0] - radius <= right)
+            & (position[:, 1] + radius >= top) & (position[:, 1] - radius <= bottom)
+        )
+        Broadphase.candidates += len(overlapping)
+        return overlapping
+
+    @staticmethod
+    def query_radius(position: npt.NDArray[np.float64], radius: npt.NDArray[np.float64],
+                     point: pygame.Vector2, reach: float) -> npt.NDArray[np.intp]:
+        found: npt.NDArray[np.intp] = Broadphase.query_box(position, radius, point.x - reach, point.y - reach,
+                                                           point.x + reach, point.y + reach)
+        distance: npt.NDArray[np.float64] = np.hypot(*(position[found] - (point.x, point.y)).T)
+        return found[distance < reach + radius[found]]
+
+    @staticmethod
+    def query_obb(position: npt.NDArray[np.float64], radius: npt.NDArray[np.float64], center: pygame.Vector2,
+                  half_size: tuple[float, float], rotation: float) -> npt.NDArray[np.intp]:
+        # az elforgatott téglalap tengelyekhez igazított befoglaló doboza
+        angle: float = math.radians(rotation)
+        extent_x: float = abs(half_size[0] * math.cos(angle)) + abs(half_size[1] * math.sin(angle))
+        extent_y: float = abs(half_size[0] * math.sin(angle)) + abs(half_size[1] * math.cos(angle))
+        return Broadphase.query_box(position, radius, center.x - extent_x, center.y - extent_y,
+                                    center.x + extent_x, center.y + extent_y)
+
+    @staticmethod
+    def report() -> str:
+        pruned: float = 1 - Broadphase.candidates / Broadphase.pairs if Broadphase.pairs else 0
+        return (f"{Broadphase.queries} queries, {Broadphase.candidates} candidate pairs of {Broadphase.pairs} "
+                f"({pruned:.0%} pruned)")
@@ -0,0 +1,224 @@
+import multiprocessing
+import os
+import queue
+import struct
+import time
+import zlib
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pygame
+
+# a bájtsorrendben az R, G, B csatorna indexe, a felület eltolásaiból számolva
+PixelFormat = tuple[int, int, int, int, int]  # bájt/pixel, pitch, R, G, B
+CapturedFrame = tuple[int, int, float]  # gyűrűbeli hely, képkocka sorszáma, időbélyeg ms-ben
+
+
+def write_png(path: str, rgb: npt.NDArray[np.uint8]) -> None:
+    # a pygame PNG mentése ~0,4 s egy képkockára, a leggyorsabb zlib szinttel a töredéke
+    height, width = rgb.shape[:2]
+    rows: npt.NDArray[np.uint8] = np.zeros((height, 1 + width * 3), np.uint8)  # soronként 0 = nincs szűrő
+    rows[:, 1:] = rgb.reshape(height, width * 3)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    with open(path, "wb") as file:
+        file.write(b"\x89PNG\r\n\x1a\n")
+        file.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        file.write(chunk(b"IDAT", zlib.compress(rows.data, 1)))
+        file.write(chunk(b"IEND", b""))
+
+
+def encode_frames(names: list[str], size: tuple[int, int], pixel_format: PixelFormat, directory: str, mode: str,
+                  filled: Any, free: Any, written: Any) -> None:
+    # külön folyamatban fut, így a tömörítés és a lemezre írás nem a játék szálától veszi el az időt
+    buffers: list[shared_memory.SharedMemory] = [shared_memory.SharedMemory(name) for name in names]
+    width, height = size
+    bytesize, pitch, red, green, blue = pixel_format
+    count: int = 0
+
+    raw = open(os.path.join(directory, "capture.rgb"), "wb") if mode == "raw" else None
+    with open(os.path.join(directory, "frames.csv"), "w", encoding="utf-8") as index:
+        index.write("frame,time_ms\n")
+        while True:
+            item: CapturedFrame | None = filled.get()
+            if item is None:
+                break
+
+            slot, frame, timestamp = item
+            pixels: npt.NDArray[np.uint8] = np.ndarray((height, pitch), np.uint8, buffers[slot].buf)
+            rgb: npt.NDArray[np.uint8] = np.ascontiguousarray(
+                pixels[:, :width * bytesize].reshape(height, width, bytesize)[:, :, (red, green, blue)]
+            )
+            del pixels
+            free.put(slot)
+
+            if raw is not None:
+                raw.write(rgb.data)
+            elif mode == "png":
+                write_png(os.path.join(directory, f"frame_{frame:06d}.png"), rgb)
+            else:
+                pygame.image.save(pygame.image.frombuffer(rgb.data, size, "RGB"),
+                                  os.path.join(directory, f"frame_{frame:06d}.{mode}"))
+            index.write(f"{frame},{timestamp:.1f}\n")
+            count += 1
+
+    if raw is not None:
+        raw.close()
+        with open(os.path.join(directory, "capture.txt"), "w", encoding="utf-8") as info:
+            info.write(f"ffmpeg -f rawvideo -pixel_format rgb24 -video_size {width}x{height} -framerate 60 "
+                       f"-i capture.rgb capture.mp4\n")
+    for buffer in buffers:
+        buffer.close()
+    written.put(count)
+
+
+class FrameCapture:
+    ring_size: int = 8  # ennyi képkocka várhat a kódolóra, utána eldobjuk az újakat
+    # raw: egyetlen rgb24 videófájl; bmp: tömörítetlen, bírja a tempót; png: kisebb, de ritkább képkockák
+    formats: tuple[str, ...] = ("raw", "bmp", "png")
+    default_directory: str = "captures"
+    poll_interval: float = 0.5  # s; ennyi időnként nézzük meg leállításkor, hogy él-e még a kódoló
+    stop_timeout: float = 60  # s; a hátralévő képkockák kiírására ennyit várunk, utána leállítjuk a kódolót
+
+    def __init__(self, directory: str = default_directory, mode: str = formats[0]) -> None:
+        self.directory: str = directory
+        self.mode: str = mode
+
+        self.buffers: list[shared_memory.SharedMemory] = []
+        self.views: list[npt.NDArray[np.uint8]] = []
+        self.worker: Any = None
+        self.filled: Any = None
+        self.free: Any = None
+        self.written: Any = None
+        self.size: tuple[int, int] = (0, 0)
+        self.output: str = ""
+
+        self.started_at: float = 0
+        self.frames: int = 0
+        self.dropped: int = 0
+
+    @property
+    def active(self) -> bool:
+        return self.worker is not None
+
+    def toggle(self, surface: pygame.Surface) -> None:
+        if self.active:
+            self.stop()
+        else:
+            self.start(surface)
+
+    def start(self, surface: pygame.Surface) -> None:
+        if self.active:
+            return
+
+        self.size = surface.get_size()
+        pitch: int = surface.get_pitch()
+        bytesize: int = surface.get_bytesize()
+        # a pixel bájtjai kis endián sorrendben követik a színcsatornák eltolását
+        shifts: tuple[int, ...] = surface.get_shifts()
+        pixel_format: PixelFormat = (bytesize, pitch, shifts[0] // 8, shifts[1] // 8, shifts[2] // 8)
+
+        self.output = os.path.join(self.directory, time.strftime("%Y%m%d-%H%M%S"))
+        os.makedirs(self.output, exist_ok=True)
+
+        # a puffereket előre lefoglaljuk, képkockánként csak másolás történik
+        for _ in range(FrameCapture.ring_size):
+            buffer: shared_memory.SharedMemory = shared_memory.SharedMemory(create=True, size=pitch * self.size[1])
+            self.buffers.append(buffer)
+            self.views.append(np.ndarray(pitch * self.size[1], np.uint8, buffer.buf))
+            # a lapok első érintése itt történjen, ne a játék első rögzített képkockáján
+            self.views[-1].fill(0)
+
+        # spawn: a pygame-et és az SDL szálait tartalmazó folyamatot nem forkoljuk
+        context: Any = multiprocessing.get_context("spawn")
+        self.filled = context.Queue()
+        self.free = context.Queue()
+        self.written = context.Queue()
+        for slot in range(FrameCapture.ring_size):
+            self.free.put(slot)
+
+        self.worker = context.Process(
+            target=encode_frames, daemon=True,
+            args=([buffer.name for buffer in self.buffers], self.size, pixel_format, self.output, self.mode,
+                  self.filled, self.free, self.written),
+        )
+        self.worker.start()
+
+        self.started_at = time.perf_counter()
+        self.frames = 0
+        self.dropped = 0
+        print(f"Capture started: {self.output} ({self.mode})")
+
+    def submit(self, surface: pygame.Surface) -> None:
+        if not self.active or surface.get_size() != self.size:
+            return
+        if not self.worker.is_alive():
+            # a kódoló kilépett, a gyűrű többé nem ürül; a felvételt lezárjuk, a játék megy tovább
+            self.fail(f"encoder exited with code {self.worker.exitcode}")
+            return
+
+        self.frames += 1
+        try:
+            slot: int = self.free.get_nowait()
+        except queue.Empty:
+            # a kódoló lemaradt; a játék nem várhat rá
+            self.dropped += 1
+            return
+
+        pixels: npt.NDArray[np.uint8] = np.asarray(surface.get_buffer())
+        np.copyto(self.views[slot], pixels)
+        # a felület zárolása a puffer felszabadításáig tart
+        del pixels
+        self.filled.put((slot, self.frames, (time.perf_counter() - self.started_at) * 1000))
+
+    def stop(self) -> None:
+        if not self.active:
+            return
+
+        self.filled.put(None)
+        deadline: float = time.perf_counter() + FrameCapture.stop_timeout
+        while True:
+            try:
+                written: int = self.written.get(timeout=FrameCapture.poll_interval)
+                break
+            except queue.Empty:
+                pass
+            if not self.worker.is_alive():
+                # kilépés előtt még elküldhette a számot
+                try:
+                    written = self.written.get_nowait()
+                    break
+                except queue.Empty:
+                    self.fail(f"encoder exited with code {self.worker.exitcode}")
+                    return
+            if time.perf_counter() > deadline:
+                self.fail(f"encoder did not finish in {FrameCapture.stop_timeout:.0f} s")
+                return
+
+        self.worker.join()
+        self.release()
+        print(f"Capture stopped: {written} frames written to {self.output}, {self.dropped} dropped")
+
+    def fail(self, reason: str) -> None:
+        if self.worker.is_alive():
+            self.worker.terminate()
+            self.worker.join(FrameCapture.poll_interval)
+        if self.worker.is_alive():
+            self.worker.kill()
+        self.worker.join()
+        # a halott kódolónak szánt elemek ne tartsák fel a kilépést
+        self.filled.cancel_join_thread()
+        self.release()
+        print(f"Capture failed: {reason}; frames up to the failure may be in {self.output}")
+
+    def release(self) -> None:
+        self.worker = None
+        self.views.clear()
+        for buffer in self.buffers:
+            buffer.close()
+            buffer.unlink()
+        self.buffers.clear()
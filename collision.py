@@ -1,21 +1,60 @@
+import math
+
+import numpy as np
+import numpy.typing as npt
 import pygame
 
+from maskcache import PositionedMask
+
 
 class Collision:
+    pixel_perfect: bool = False  # a körök és téglalapok helyett a képek maszkjai ütköznek
+
+    @staticmethod
+    def mask_collision(mask1: PositionedMask, center1: pygame.Vector2,
+                       mask2: PositionedMask, center2: pygame.Vector2) -> pygame.Vector2 | None:
+        # a maszkok egész pixeleken fekszenek, a közös pontot logikai koordinátában adjuk vissza
+        left1: int = round(center1.x) + mask1[1][0]
+        top1: int = round(center1.y) + mask1[1][1]
+        overlap: tuple[int, int] | None = mask1[0].overlap(
+            mask2[0], (round(center2.x) + mask2[1][0] - left1, round(center2.y) + mask2[1][1] - top1)
+        )
+        if overlap is None:
+            return None
+        return pygame.Vector2(left1 + overlap[0], top1 + overlap[1])
+
     @staticmethod
     def circle_circle_collision(circle1_center: pygame.Vector2, circle1_radius: float,
                                 circle2_center: pygame.Vector2, circle2_radius: float) -> bool:
         return circle1_center.distance_to(circle2_center) < circle1_radius + circle2_radius
 
+    @staticmethod
+    def obb_circles_collision(center: pygame.Vector2, half_size: tuple[float, float], rotation: float,
+                              centers: npt.NDArray[np.float64],
+                              radii: npt.NDArray[np.float64]) -> npt.NDArray[np.bool_]:
+        # a téglalap saját tengelyeire vetített körközéppontokat a téglalapra vágva kapjuk a legközelebbi pontjait;
+        # a rotation ugyanaz a szög, amivel a sarkai a középpont körül el vannak forgatva
+        angle: float = math.radians(rotation)
+        cos: float = math.cos(angle)
+        sin: float = math.sin(angle)
+        offset: npt.NDArray[np.float64] = centers - (center.x, center.y)
+        local_x: npt.NDArray[np.float64] = offset[:, 0] * cos + offset[:, 1] * sin
+        local_y: npt.NDArray[np.float64] = offset[:, 1] * cos - offset[:, 0] * sin
+
+        distance_x: npt.NDArray[np.float64] = local_x - np.clip(local_x, -half_size[0], half_size[0])
+        distance_y: npt.NDArray[np.float64] = local_y - np.clip(local_y, -half_size[1], half_size[1])
+        return distance_x * distance_x + distance_y * distance_y < radii * radii
+
     @staticmethod
     def rectangle_circle_collision(rect_center: pygame.Vector2, verticies: list[pygame.Vector2],
                                    circle_center: pygame.Vector2, radius: float) -> bool:
-        closest_point: pygame.Vector2 | None = Collision.intersection_of_segment_rect(verticies,
-                                                                               (rect_center, circle_center))
-
-        if not closest_point:
-            return True
-        return closest_point.distance_to(circle_center) < radius
+        # a szomszédos csúcsokból a téglalap oldalai és elforgatása
+        side1: pygame.Vector2 = verticies[1] - verticies[0]
+        side2: pygame.Vector2 = verticies[2] - verticies[1]
+        return bool(Collision.obb_circles_collision(
+            rect_center, (side2.length() / 2, side1.length() / 2), math.degrees(math.atan2(side2.y, side2.x)),
+            np.array([(circle_center.x, circle_center.y)]), np.array([radius]),
+        )[0])
 
     @staticmethod
     def intersection_of_segment_rect(verticies: list[pygame.Vector2], segment: tuple[pygame.Vector2, pygame.Vector2]) \
@@ -0,0 +1,81 @@
+from collections.abc import Iterable
+
+import pygame
+
+from resolution import Resolution
+
+
+class DirtyRenderer:
+    default_threshold: float = 0.5  # a képernyő területének aránya
+
+    def __init__(self, screen: pygame.Surface, threshold: float = default_threshold, enabled: bool = True) -> None:
+        self.screen: pygame.Surface = screen
+        self.screen_rect: pygame.Rect = screen.get_rect()
+        self.threshold: float = threshold
+        self.enabled: bool = enabled
+
+        # az előző képkockán rajzolt területek, ezeket kell a háttérrel visszaállítani
+        self.previous: list[pygame.Rect] = []
+        self.current: list[pygame.Rect] = []
+        # csak a kijelzőn frissítendő területek; ezeket a rajzolójuk maga állítja vissza, nem a háttérből
+        self.overlay: list[pygame.Rect] = []
+        self.full_redraw: bool = True
+
+        self.frames: int = 0
+        self.full_frames: int = 0
+
+    def invalidate(self) -> None:
+        self.full_redraw = True
+
+    def begin(self, background: pygame.Surface) -> None:
+        self.current = []
+        self.overlay = []
+        if not self.enabled or self.full_redraw or self.over_threshold(self.previous):
+            self.full_redraw = True
+            self.screen.blit(background, (0, 0))
+            return
+
+        for rect in self.previous:
+            self.screen.blit(background, rect, rect)
+
+    def add(self, rect: pygame.Rect | None) -> None:
+        if rect is None:
+            return
+
+        clipped: pygame.Rect = rect.clip(self.screen_rect)
+        if clipped.width > 0 and clipped.height > 0:
+            self.current.append(clipped)
+
+    def add_all(self, rects: Iterable[pygame.Rect | None]) -> None:
+        for rect in rects:
+            self.add(rect)
+
+    def add_overlay(self, rects: list[pygame.Rect]) -> None:
+        self.overlay += rects
+
+    def present(self) -> None:
+        self.frames += 1
+        window: pygame.Surface = pygame.display.get_surface()
+        scaled: bool = self.screen is not window
+        # az előző és a mostani területek nagyrészt fedik egymást, ezért elég az egyiket a küszöbhöz mérni
+        if self.full_redraw or self.over_threshold(self.current):
+            self.full_frames += 1
+            if scaled:
+                # más belső felbontásnál a teljes kép egy lépésben kerül az ablakra
+                Resolution.present(self.screen, window)
+                pygame.display.update(Resolution.viewport)
+            else:
+                pygame.display.update()
+        elif scaled:
+            pygame.display.update(Resolution.present_rects(self.screen, window,
+                                                           self.previous + self.current + self.overlay))
+        else:
+            pygame.display.update(self.previous + self.current + self.overlay)
+
+        self.previous = self.current
+        self.full_redraw = False
+
+    def over_threshold(self, rects: list[pygame.Rect]) -> bool:
+        # az átfedéseket nem vonjuk le, így inkább hamarabb vált teljes újrarajzolásra
+        area: int = sum(rect.width * rect.height for rect in rects)
+        return area > self.threshold * self.screen_rect.width * self.screen_rect.height
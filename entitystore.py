@@ -0,0 +1,226 @@
+from collections.abc import Iterator
+from typing import Any, Generic, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+import pygame
+
+from broadphase import Broadphase
+from collision import Collision
+from renderqueue import RenderLayer, RenderQueue
+from resolution import Resolution
+
+
+class Entity:
+    image: pygame.Surface
+
+    def __init__(self, position: pygame.Vector2, velocity: pygame.Vector2, rotation_speed: float,
+                 margin: float, bound: float, radius: float) -> None:
+        # amíg nincs tárolóban, a saját mezőiben él; felvételkor a tároló tömbjeibe kerül
+        self.store: "EntityStore[Any] | None" = None
+        self.index: int = -1
+
+        self._position: pygame.Vector2 = pygame.Vector2(position)
+        self._rotation: float = 0
+        self._moving: bool = True
+        self.velocity_vector: pygame.Vector2 = pygame.Vector2(velocity)
+        self.rotation_speed: float = rotation_speed
+        self.margin: float = margin  # ennyivel a képernyőn kívül tűnik el
+        self.bound: float = bound  # a kép köré írt kör sugara, a láthatósághoz
+        self.radius: float = radius  # az ütközési kör sugara
+
+    @property
+    def position(self) -> pygame.Vector2:
+        if self.store is None:
+            return self._position
+        return pygame.Vector2(*self.store.position[self.index])
+
+    @position.setter
+    def position(self, position: pygame.Vector2) -> None:
+        if self.store is None:
+            self._position = pygame.Vector2(position)
+        else:
+            self.store.position[self.index] = (position[0], position[1])
+
+    @property
+    def rotation(self) -> float:
+        if self.store is None:
+            return self._rotation
+        return float(self.store.rotation[self.index])
+
+    @rotation.setter
+    def rotation(self, rotation: float) -> None:
+        if self.store is None:
+            self._rotation = rotation
+        else:
+            self.store.rotation[self.index] = rotation
+
+    @property
+    def moving(self) -> bool:
+        if self.store is None:
+            return self._moving
+        return bool(self.store.moving[self.index])
+
+    @moving.setter
+    def moving(self, moving: bool) -> None:
+        if self.store is None:
+            self._moving = moving
+        else:
+            self.store.moving[self.index] = moving
+
+    def alive(self) -> bool:
+        return self.store is not None
+
+    def kill(self) -> None:
+        if self.store is not None:
+            self.store.remove(self)
+
+
+T = TypeVar("T", bound=Entity)
+
+
+class EntityStore(Generic[T]):
+    initial_capacity: int = 64
+    fields: tuple[str, ...] = ("position", "velocity", "rotation", "rotation_speed", "moving", "margin", "bound",
+                              "radius")
+
+    def __init__(self) -> None:
+        # az élő elemek mindig a tömbök elején, egymás után vannak, sorrendjük az entities listáé
+        self.count: int = 0
+        self.capacity: int = EntityStore.initial_capacity
+        self.entities: list[T] = []
+
+        self.position: npt.NDArray[np.float64] = np.zeros((self.capacity, 2))
+        self.velocity: npt.NDArray[np.float64] = np.zeros((self.capacity, 2))
+        self.rotation: npt.NDArray[np.float64] = np.zeros(self.capacity)
+        self.rotation_speed: npt.NDArray[np.float64] = np.zeros(self.capacity)
+        self.moving: npt.NDArray[np.bool_] = np.zeros(self.capacity, np.bool_)
+        self.margin: npt.NDArray[np.float64] = np.zeros(self.capacity)
+        self.bound: npt.NDArray[np.float64] = np.zeros(self.capacity)
+        self.radius: npt.NDArray[np.float64] = np.zeros(self.capacity)
+
+    def grow(self) -> None:
+        self.capacity *= 2
+        for name in EntityStore.fields:
+            array: npt.NDArray[Any] = getattr(self, name)
+            grown: npt.NDArray[Any] = np.zeros((self.capacity, *array.shape[1:]), array.dtype)
+            grown[:self.count] = array[:self.count]
+            setattr(self, name, grown)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(list(self.entities))
+
+    def sprites(self) -> list[T]:
+        return list(self.entities)
+
+    def add(self, *entities: T) -> None:
+        for entity in entities:
+            if entity.store is not None:
+                continue
+            if self.count == self.capacity:
+                self.grow()
+
+            index: int = self.count
+            self.position[index] = (entity._position.x, entity._position.y)
+            self.velocity[index] = (entity.velocity_vector.x, entity.velocity_vector.y)
+            self.rotation[index] = entity._rotation
+            self.rotation_speed[index] = entity.rotation_speed
+            self.moving[index] = entity._moving
+            self.margin[index] = entity.margin
+            self.bound[index] = entity.bound
+            self.radius[index] = entity.radius
+
+            entity.store = self
+            entity.index = index
+            self.entities.append(entity)
+            self.count += 1
+
+    def detach(self, entity: T) -> None:
+        # a kivett példány a legutóbbi állapotát megtartja, pl. a begyűjtési részecskékhez
+        entity._position = pygame.Vector2(*self.position[entity.index])
+        entity._rotation = float(self.rotation[entity.index])
+        entity._moving = bool(self.moving[entity.index])
+        entity.store = None
+        entity.index = -1
+
+    def remove(self, entity: T) -> None:
+        keep: npt.NDArray[np.bool_] = np.ones(self.count, np.bool_)
+        keep[entity.index] = False
+        self.compact(keep)
+
+    def empty(self) -> None:
+        self.compact(np.zeros(self.count, np.bool_))
+
+    def compact(self, keep: npt.NDArray[np.bool_]) -> None:
+        removed: npt.NDArray[np.intp] = np.flatnonzero(~keep)
+        if len(removed) == 0:
+            return
+        for index in removed.tolist():
+            self.detach(self.entities[index])
+
+        alive: int = int(keep.sum())
+        for name in EntityStore.fields:
+            array: npt.NDArray[Any] = getattr(self, name)
+            array[:alive] = array[:self.count][keep]
+        self.entities = [entity for entity, kept in zip(self.entities, keep.tolist()) if kept]
+        # a sorrend megmarad, így csak az első kivett elem utániak indexe változik
+        for index in range(int(removed[0]), alive):
+            self.entities[index].index = index
+        self.count = alive
+
+    def update(self) -> None:
+        if self.count == 0:
+            return
+
+        count: int = self.count
+        position: npt.NDArray[np.float64] = self.position[:count]
+        position += self.velocity[:count] * self.moving[:count, None]
+        self.rotation[:count] = (self.rotation[:count] + self.rotation_speed[:count]) % 360
+
+        margin: npt.NDArray[np.float64] = self.margin[:count]
+        inside: npt.NDArray[np.bool_] = (
+            (position[:, 0] >= -margin) & (position[:, 0] <= Resolution.logical[0] + margin)
+            & (position[:, 1] >= -margin) & (position[:, 1] <= Resolution.logical[1] + margin)
+        )
+        if not inside.all():
+            self.compact(inside)
+
+    # a befoglaló köreikkel a körbe, illetve az elforgatott téglalapba belógó elemek
+    def query_radius(self, point: pygame.Vector2, radius: float) -> list[T]:
+        found: npt.NDArray[np.intp] = Broadphase.query_radius(self.position[:self.count], self.bound[:self.count],
+                                                              point, radius)
+        return [self.entities[index] for index in found.tolist()]
+
+    def query_obb(self, center: pygame.Vector2, half_size: tuple[float, float], rotation: float) -> list[T]:
+        found: npt.NDArray[np.intp] = Broadphase.query_obb(self.position[:self.count], self.bound[:self.count],
+                                                           center, half_size, rotation)
+        return [self.entities[index] for index in found.tolist()]
+
+    def collide_obb(self, center: pygame.Vector2, half_size: tuple[float, float], rotation: float) -> list[T]:
+        # a jelöltek ütközési körei egyetlen lépésben a téglalappal szemben
+        found: npt.NDArray[np.intp] = Broadphase.query_obb(self.position[:self.count], self.bound[:self.count],
+                                                           center, half_size, rotation)
+        hits: npt.NDArray[np.bool_] = Collision.obb_circles_collision(center, half_size, rotation,
+                                                                     self.position[found], self.radius[found])
+        return [self.entities[index] for index in found[hits].tolist()]
+
+    def submit(self, queue: RenderQueue, layer: RenderLayer) -> None:
+        # láthatóság a befoglaló körökkel egyben, a képernyőn kívülieket forgatni sem kell
+        count: int = self.count
+        position: npt.NDArray[np.float64] = self.position[:count]
+        bound: npt.NDArray[np.float64] = self.bound[:count]
+        visible: npt.NDArray[np.bool_] = (
+            (position[:, 0] > -bound) & (position[:, 0] < Resolution.logical[0] + bound)
+            & (position[:, 1] > -bound) & (position[:, 1] < Resolution.logical[1] + bound)
+        )
+        indices: list[int] = np.flatnonzero(visible).tolist()
+        queue.cull(count - len(indices))
+
+        xs: list[float] = position[:, 0].tolist()
+        ys: list[float] = position[:, 1].tolist()
+        rotations: list[float] = self.rotation[:count].tolist()
+        for index in indices:
+            queue.submit_rotated(self.entities[index].image, rotations[index], (xs[index], ys[index]), layer)
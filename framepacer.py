@@ -0,0 +1,104 @@
+import time
+
+import pygame
+
+# állapot neve -> [falióra idő, processzoridő, ciklusok, kirajzolt képkockák]
+StateUsage = list[float]
+
+
+class FramePacer:
+    active_fps: int = 60
+    background_fps: int = 10  # kis méretre tett vagy fókuszt vesztett ablaknál
+
+    input_events: frozenset[int] = frozenset((
+        pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION,
+        pygame.MOUSEWHEEL,
+    ))
+    # ezek után az ablak tartalma elveszhetett, akkor is újra kell rajzolni, ha semmi sem változott
+    expose_events: frozenset[int] = frozenset((
+        pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWSHOWN, pygame.WINDOWRESTORED,
+        pygame.WINDOWSIZECHANGED, pygame.WINDOWFOCUSGAINED,
+    ))
+
+    def __init__(self, on_demand: bool = True, pause_music: bool = False) -> None:
+        self.on_demand: bool = on_demand
+        self.pause_music: bool = pause_music
+
+        self.focused: bool = True
+        self.visible: bool = True
+        self.redraw_requested: bool = True
+        self.music_paused: bool = False
+
+        self.usage: dict[str, StateUsage] = {}
+        self.last_wall: float = time.perf_counter()
+        self.last_cpu: float = time.process_time()
+        self.rendered: bool = False
+
+    def start(self) -> None:
+        # a betöltés ne számítson bele az első állapot terhelésébe
+        self.last_wall = time.perf_counter()
+        self.last_cpu = time.process_time()
+
+    @property
+    def active(self) -> bool:
+        return self.focused and self.visible
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        if event.type in FramePacer.input_events or event.type in FramePacer.expose_events:
+            self.redraw_requested = True
+
+        if event.type == pygame.WINDOWFOCUSLOST:
+            self.focused = False
+        elif event.type == pygame.WINDOWFOCUSGAINED:
+            self.focused = True
+        elif event.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+            self.visible = False
+        elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN, pygame.WINDOWEXPOSED):
+            self.visible = True
+        else:
+            return
+        self.update_music()
+
+    def update_music(self) -> None:
+        if not self.pause_music or pygame.mixer.get_init() is None:
+            return
+        if not self.active and not self.music_paused:
+            pygame.mixer.music.pause()
+            self.music_paused = True
+        elif self.active and self.music_paused:
+            pygame.mixer.music.unpause()
+            self.music_paused = False
+
+    def request_redraw(self) -> None:
+        self.redraw_requested = True
+
+    def should_render(self, changed: bool = True) -> bool:
+        # a rejtett ablakra felesleges rajzolni, a statikus menüt pedig csak változáskor
+        render: bool = self.visible and (not self.on_demand or changed or self.redraw_requested)
+        if render:
+            self.redraw_requested = False
+        self.rendered = self.rendered or render
+        return render
+
+    def tick(self, clock: pygame.time.Clock, state: str) -> None:
+        clock.tick(FramePacer.active_fps if self.active else FramePacer.background_fps)
+
+        # a várakozás is az állapothoz tartozik, így a processzoridő aránya a tényleges terhelés
+        wall: float = time.perf_counter()
+        cpu: float = time.process_time()
+        usage: StateUsage = self.usage.setdefault(state, [0, 0, 0, 0])
+        usage[0] += wall - self.last_wall
+        usage[1] += cpu - self.last_cpu
+        usage[2] += 1
+        usage[3] += self.rendered
+        self.last_wall = wall
+        self.last_cpu = cpu
+        self.rendered = False
+
+    def report(self) -> str:
+        lines: list[str] = [f"{'state':<14}{'time s':>9}{'cpu s':>9}{'cpu %':>8}{'ticks/s':>9}{'frames/s':>10}"]
+        for state, (wall, cpu, ticks, frames) in self.usage.items():
+            wall = max(wall, 1e-9)
+            lines.append(f"{state:<14}{wall:9.1f}{cpu:9.2f}{cpu / wall * 100:8.1f}{ticks / wall:9.1f}"
+                         f"{frames / wall:10.1f}")
+        return "\n".join(lines)
@@ -1,50 +1,102 @@
 import json
 import typing
-from collections.abc import Callable
+from collections.abc import Callable, Hashable
 from enum import Enum
+from functools import cached_property
 
 import pygame
 
+from assets import Assets
+from broadphase import Broadphase
+from capture import FrameCapture
 from debris import Debris
+from dirtyrect import DirtyRenderer
+from framepacer import FramePacer
 from laser import Laser
+from memory import SurfaceTracker
 from meteorite import Meteorite
+from particles import Particles
 from player import Player
+from preload import Preloader
+from profiler import StartupProfiler
+from renderqueue import RenderLayer, RenderQueue
+from resolution import Resolution
+from scene import Scene, SceneManager
 from sound import Sound
+from starfield import Starfield
 from uielemnts import Button, Counter, Text, UpgradeCard
+from uilayer import UILayer
 from upgrade import UpgradeManager
 
 GameState = Enum("GameState", ["MAIN_MENU", "IN_GAME", "UPGRADE_MENU"])
 
 
 class Game:
-    def __init__(self) -> None:
-        pygame.init()
+    default_background: str = "img/background/main_menu.png"
+    laser_background: str = "img/background/main_menu_laser.png"
+    game_background: str = "img/background/space.png"
+
+    # a súgó képei az Assets cache kulcsaival, hogy a jelenet félretehesse őket
+    help_images: dict[str, tuple[typing.Any, ...]] = {
+        "wasd": ("rotozoomed", "img/how to play elements/wasd.png", 0, 0.7, True),
+        "arrows": ("rotozoomed", "img/how to play elements/arrows1.png", 0, 0.7, True),
+        "mouseleft": ("rotozoomed", "img/how to play elements/mouse_left.png", 0, 0.17, True),
+        "ss_debris": ("image", "img/how to play elements/spaceship_and_debris.png", True),
+        "collision": ("image", "img/how to play elements/collision.png", True),
+    }
+
+    def __init__(self, profiler: StartupProfiler | None = None, exit_after_first_frame: bool = False,
+                 scene_report: bool = False, dirty_rects: bool = True, render_scale: float = 1,
+                 on_demand: bool = True, pause_music: bool = False, cpu_report: bool = False,
+                 capture: FrameCapture | None = None, start_capture: bool = False) -> None:
+        self.profiler: StartupProfiler = profiler or StartupProfiler()
+        self.exit_after_first_frame: bool = exit_after_first_frame
+        self.scene_report: bool = scene_report
+        self.cpu_report: bool = cpu_report
+        self.start_capture: bool = start_capture
+
+        # csak a kijelzőt indítjuk el, a font és a mixer az első használatkor indul
+        pygame.display.init()
+        self.profiler.mark("display init")
 
         pygame.display.set_caption("Galactic Salvage")
         res = pygame.display.Info()
-        self.screen_resolution: tuple[int, int] = (
-            min(1600, res.current_w),
-            min(900, res.current_h),
+        # a játék logikai felbontása fix, az ablak legfeljebb akkora, amekkora a monitoron elfér
+        self.screen_resolution: tuple[int, int] = Resolution.logical
+        self.window_resolution: tuple[int, int] = (
+            min(Resolution.logical[0], res.current_w),
+            min(Resolution.logical[1], res.current_h),
         )
-
-        self.screen: pygame.Surface = pygame.display.set_mode(self.screen_resolution)
+        Resolution.configure(scale=render_scale, window=self.window_resolution)
+
+        self.window: pygame.Surface = pygame.display.set_mode(self.window_resolution)
+        # a játéktér a belső felbontáson készül; ha ez egyezik az ablakkal, közvetlenül oda rajzolunk
+        self.screen: pygame.Surface = self.window
+        if Resolution.render_size() != Resolution.viewport.size:
+            self.screen = SurfaceTracker.track(pygame.Surface(Resolution.render_size()).convert(), "background",
+                                               "Game.screen")
         self.clock: pygame.time.Clock = pygame.time.Clock()
+        # a menük csak változáskor rajzolódnak újra, a háttérbe került ablak ritkábban fut
+        self.pacer: FramePacer = FramePacer(on_demand, pause_music)
+        self.capture: FrameCapture = capture if capture is not None else FrameCapture()
+        # játék közben csak a megváltozott területeket rajzoljuk újra, a menük mindig teljes képkockák
+        self.renderer: DirtyRenderer = DirtyRenderer(self.screen, enabled=dirty_rects)
+        self.render_queue: RenderQueue = RenderQueue(self.screen)
+        self.starfield: Starfield = Starfield(self.screen)
+        self.profiler.mark("set mode")
+
+        self.preloader: Preloader = Preloader(self.window)
+        self.preloader.run()
+        self.window.fill("black")
+        self.profiler.mark("preload")
 
         self.player: Player = Player(
             self.screen_resolution[0] // 2, self.screen_resolution[1] // 2, 0
         )
+        self.profiler.mark("player")
 
         self.game_state: GameState = GameState["MAIN_MENU"]
 
-        self.counter_font: pygame.font.Font = pygame.font.Font(None, 200)
-
-        self.font80: pygame.font.Font = pygame.font.Font("font/Beyonders-6YoJM.ttf", 80)
-        self.font40: pygame.font.Font = pygame.font.Font("font/Beyonders-6YoJM.ttf", 40)
-        self.font30: pygame.font.Font = pygame.font.Font("font/Beyonders-6YoJM.ttf", 30)
-        self.font20: pygame.font.Font = pygame.font.Font("font/Beyonders-6YoJM.ttf", 20)
-        self.font15: pygame.font.Font = pygame.font.Font("font/Beyonders-6YoJM.ttf", 15)
-        self.font_10: pygame.font.Font = pygame.font.Font("font/Anta-Regular.ttf", 25)
-
         self.font_color = pygame.Color(255, 87, 51)
 
         self.meteorite_spawn_rate: float = 0.5  # hány darab keletkezzen másodpercenként
@@ -81,51 +133,6 @@ class Game:
         self.screen_note: bool = False
         self.settings_screen: bool = False
 
-        self.wasd: pygame.Surface = pygame.image.load("img/how to play elements/wasd.png").convert_alpha()
-        self.wasd: pygame.Surface = pygame.transform.rotozoom(self.wasd, 0, 0.7)
-        
-        self.arrows: pygame.Surface = pygame.image.load("img/how to play elements/arrows1.png")
-        self.arrows: pygame.Surface = pygame.transform.rotozoom(self.arrows, 0, 0.7)
-
-        self.mouseleft: pygame.Surface = pygame.image.load("img/how to play elements/mouse_left.png")
-        self.mouseleft: pygame.Surface = pygame.transform.rotozoom(self.mouseleft, 0, 0.17)
-        
-        self.mouseleft: pygame.Surface = pygame.image.load("img/how to play elements/mouse_left.png")
-        self.mouseleft: pygame.Surface = pygame.transform.rotozoom(self.mouseleft, 0, 0.17)
-
-        self.ss_debris: pygame.Surface = pygame.image.load("img/how to play elements/spaceship_and_debris.png")
-        self.collision: pygame.Surface = pygame.image.load("img/how to play elements/collision.png")
-
-        self.text1: Text = Text(
-            "Irányítás",
-            self.font30,
-            (0, 0, 0),
-            center=(350, 210)
-        )
-        self.text2: Text = Text(
-            "vagy",
-            self.font15,
-            (0, 0, 0),
-            center=(335, 540)
-        )
-        self.text3: Text = Text(
-            "Játék menete",
-            self.font30,
-            (0, 0, 0),
-            center=(900, 210)
-        )
-        self.text4: Text = Text(
-            ">>   + pont",
-            self.font30,
-            (0, 0, 0),
-            center=(1170, 370)
-        )
-        self.text5: Text = Text(
-            ">>",
-            self.font30,
-            (0, 0, 0),
-            center=(920, 590)
-        )
         self.play_again_text: Text = Text(
             "Visszalépéshez nyomd meg szóközt!",
             self.font20,
@@ -196,16 +203,6 @@ class Game:
             lambda: self.game_state == GameState["MAIN_MENU"],
             center=(int(self.screen_resolution[0] / 2), 790),
         )
-        self.back_button: Button = Button(
-            (150, 100),
-            "vissza",
-            self.font20,
-            (63, 63, 63),
-            "white",
-            lambda: self.set_game_state(GameState["MAIN_MENU"]),
-            lambda: self.game_state == GameState["UPGRADE_MENU"],
-            center=(100, 100),
-        )
 
         self.laser_button: Button = Button(
             (500, 150),
@@ -237,32 +234,149 @@ class Game:
             lambda: self.settings_screen,
             center=(300, 700),
         )
-        self.point_counter: Counter = Counter(
-            self.font40, "", (255, 255, 255), center=(300, 100)
-        )
         self.in_game_counter: Counter = Counter(
             self.font30, "Jelenlegi pontszámod: ", (255, 255, 255), topleft=(20, 20)
         )
 
-        self.default_background: pygame.Surface = pygame.image.load(
-            "img/background/main_menu.png"
-        ).convert()
-        self.laser_background: pygame.Surface = pygame.image.load(
-            "img/background/main_menu_laser.png"
-        ).convert()
-        self.current_background: pygame.Surface = self.default_background
-        self.next_background: pygame.Surface = self.default_background
+        self.current_background: str = Game.default_background
+        self.next_background: str = Game.default_background
         self.background_opacity: float = 1
 
         self.load()
 
+        # a fejlesztési menü kártyái az első belépéskor készülnek el
         self.upgrade_cards: list[UpgradeCard] = []
-        self.new_upgrades()
 
-    def run(self) -> None:
-        # main menu
-        bg_surf: pygame.Surface = self.background_generate()
+        # a menük kész képe, csak akkor rakjuk össze újra, ha valamelyik elem állapota megváltozik
+        self.main_menu_layer: UILayer = UILayer("MAIN_MENU", self.compose_main_menu, self.main_menu_state)
+        self.upgrade_menu_layer: UILayer = UILayer("UPGRADE_MENU", self.compose_upgrade_menu, self.upgrade_menu_state)
+        self.profiler.mark("menus")
+
+        menu_backgrounds: list[Hashable] = [
+            ("image", Game.default_background, False),
+            ("image", Game.laser_background, False),
+        ]
+        self.scenes: SceneManager = SceneManager(
+            [
+                Scene(
+                    "MAIN_MENU",
+                    menu_backgrounds + list(Game.help_images.values()),
+                    lambda: [
+                        self.title_text, self.run_text, self.upgrade_button,
+                        self.help_button, self.settings_button,
+                        self.text1, self.text2, self.text3, self.text4, self.text5,
+                        self.laser_button, self.sound_button, self.music_button,
+                        self.laser_button_text, self.sound_button_text, self.music_button_text,
+                        self.main_menu_layer,
+                    ],
+                ),
+                Scene(
+                    "IN_GAME",
+                    [("image", Game.game_background, False)],
+                    lambda: [self.play_again_text, self.death_text, self.starfield],
+                ),
+                Scene(
+                    "UPGRADE_MENU",
+                    menu_backgrounds + [
+                        ("scaled_by", f"img/upgrades/{upgrade}.png", 2.0, True)
+                        for upgrade in self.upgrade_manager.upgrades
+                    ],
+                    lambda: [self.back_button, *self.upgrade_cards, self.upgrade_menu_layer],
+                ),
+            ],
+            self.game_state.name,
+        )
+        self.prefetch_neighbours()
+        self.profiler.mark("scenes")
+
+    @cached_property
+    def font80(self) -> pygame.font.Font:
+        return Assets().font("font/Beyonders-6YoJM.ttf", 80)
+
+    @cached_property
+    def font40(self) -> pygame.font.Font:
+        return Assets().font("font/Beyonders-6YoJM.ttf", 40)
+
+    @cached_property
+    def font30(self) -> pygame.font.Font:
+        return Assets().font("font/Beyonders-6YoJM.ttf", 30)
+
+    @cached_property
+    def font20(self) -> pygame.font.Font:
+        return Assets().font("font/Beyonders-6YoJM.ttf", 20)
+
+    @cached_property
+    def font15(self) -> pygame.font.Font:
+        return Assets().font("font/Beyonders-6YoJM.ttf", 15)
+
+    @cached_property
+    def font_10(self) -> pygame.font.Font:
+        return Assets().font("font/Anta-Regular.ttf", 25)
+
+    @cached_property
+    def counter_font(self) -> pygame.font.Font:
+        return Assets().font(None, 200)
+
+    # súgó képernyő elemei, csak az első megnyitáskor készülnek el
+    @property
+    def wasd(self) -> pygame.Surface:
+        return Assets().load(Game.help_images["wasd"])  # type: ignore
+
+    @property
+    def arrows(self) -> pygame.Surface:
+        return Assets().load(Game.help_images["arrows"])  # type: ignore
+
+    @property
+    def mouseleft(self) -> pygame.Surface:
+        return Assets().load(Game.help_images["mouseleft"])  # type: ignore
+
+    @property
+    def ss_debris(self) -> pygame.Surface:
+        return Assets().load(Game.help_images["ss_debris"])  # type: ignore
+
+    @property
+    def collision(self) -> pygame.Surface:
+        return Assets().load(Game.help_images["collision"])  # type: ignore
+
+    @cached_property
+    def text1(self) -> Text:
+        return Text("Irányítás", self.font30, (0, 0, 0), center=(350, 210))
+
+    @cached_property
+    def text2(self) -> Text:
+        return Text("vagy", self.font15, (0, 0, 0), center=(335, 540))
+
+    @cached_property
+    def text3(self) -> Text:
+        return Text("Játék menete", self.font30, (0, 0, 0), center=(900, 210))
+
+    @cached_property
+    def text4(self) -> Text:
+        return Text(">>   + pont", self.font30, (0, 0, 0), center=(1170, 370))
+
+    @cached_property
+    def text5(self) -> Text:
+        return Text(">>", self.font30, (0, 0, 0), center=(920, 590))
+
+    # fejlesztési menü elemei
+    @cached_property
+    def back_button(self) -> Button:
+        return Button(
+            (150, 100),
+            "vissza",
+            self.font20,
+            (63, 63, 63),
+            "white",
+            lambda: self.set_game_state(GameState["MAIN_MENU"]),
+            lambda: self.game_state == GameState["UPGRADE_MENU"],
+            center=(100, 100),
+        )
+
+    @cached_property
+    def point_counter(self) -> Counter:
+        return Counter(self.font40, "", (255, 255, 255), center=(300, 100))
 
+    def run(self) -> None:
         pygame.time.set_timer(
             self.meteor_spawn_event, int(1000 / self.meteorite_spawn_rate)
         )
@@ -270,13 +384,13 @@ class Game:
             self.debris_spawn_event, int(1000 / self.debris_spawn_rate)
         )
 
-        pygame.mixer.music.load(self.sound.all_music[self.sound.music_index])
-        self.sound.controll_volume()
-        pygame.mixer.music.play(-1)
-
         running: bool = True
+        if self.start_capture:
+            self.capture.start(self.window)
+        self.pacer.start()
         while running:
             for event in pygame.event.get():
+                self.pacer.handle_event(event)
                 if event.type == pygame.QUIT:
                     running = False
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -323,14 +437,16 @@ class Game:
                             pygame.mixer.music.stop()
                             self.sound.music_index += 1
                             self.sound.music_index_controll()
-                            pygame.mixer.music.load(
-                                self.sound.all_music[self.sound.music_index]
-                            )
+                            self.sound.load_music()
                             pygame.mixer.music.play(-1)
                         elif (
                             self.game_state == GameState["IN_GAME"] and self.player.dead
                         ):
                             self.reset()
+                    if event.key == pygame.K_F3:
+                        self.dump_memory()
+                    if event.key == pygame.K_F9:
+                        self.capture.toggle(self.window)
                     if (
                         event.key == pygame.K_r
                         and self.game_state == GameState["UPGRADE_MENU"]
@@ -348,17 +464,25 @@ class Game:
                 if keys[pygame.K_DOWN] or keys[pygame.K_s]:
                     self.player.slow_down()
 
-                self.screen.blit(bg_surf, (0, 0))
+                self.renderer.begin(self.starfield.base(self.background_generate()))
+                self.starfield.update(self.player.velocity)
+                self.renderer.add_overlay(self.starfield.draw(self.screen))
 
                 self.in_game_counter.update(self.current_points)
-                self.in_game_counter.draw(self.screen)
+                self.renderer.add(self.in_game_counter.draw(self.screen))
 
-                Meteorite.meteorites.update(screen=self.screen)  # type: ignore
-                Debris.debris_group.update(screen=self.screen)  # type: ignore
+                Meteorite.meteorites.update()
+                Debris.debris_group.update()
+                # a begyűjtött törmelék a player.update alatt tűnik el, ezért még előtte kirajzoljuk
+                Meteorite.meteorites.submit(self.render_queue, RenderLayer["METEORITE"])
+                Debris.debris_group.submit(self.render_queue, RenderLayer["DEBRIS"])
+                self.renderer.add_all(self.render_queue.flush())
 
                 if self.player.dead:
-                    self.play_again_text.draw(self.screen)
-                    self.death_text.draw(self.screen)
+                    # halál után már csak a főmenü jöhet, annak a képei előre betöltődnek
+                    self.scenes.prefetch("MAIN_MENU")
+                    self.renderer.add_all(self.play_again_text.draw(self.screen))
+                    self.renderer.add_all(self.death_text.draw(self.screen))
 
                 if self.laser.enabled:
                     self.point_multiplier = 15
@@ -366,12 +490,15 @@ class Game:
                     self.point_multiplier = 10
 
                 self.current_points += self.player.update() * self.point_multiplier
-                self.player.grabber.check_collect(Debris.debris_group.sprites())  # type: ignore
-                collision: bool = self.player.check_collision(Meteorite.meteorites.sprites())  # type: ignore
+                self.player.grabber.check_collect(Debris.debris_group)
+                collision: bool = self.player.check_collision(Meteorite.meteorites)
 
                 if collision:
                     self.player.get_hit()
-                self.player.draw(self.screen)
+                self.renderer.add_all(self.player.draw(self.screen))
+
+                Particles().update()
+                self.renderer.add(Particles().draw(self.screen))
 
                 if (
                     self.player.check_kill_collision(
@@ -384,68 +511,81 @@ class Game:
                     self.player.die()
 
                 self.in_game_counter.update(self.current_points)
-                self.in_game_counter.draw(self.screen)
+                self.renderer.add(self.in_game_counter.draw(self.screen))
 
-                self.laser.update(self.screen)
+                self.renderer.add_all(self.laser.update(self.screen))
             elif self.game_state == GameState["MAIN_MENU"]:
                 self.change_background()
-                self.screen.blit(self.current_background, (0, 0))
-                self.help_button.draw(self.screen)
-                self.settings_button.draw(self.screen)
-
-                if self.screen_note:
-                    pygame.draw.rect(self.screen, "white", (200, 150, 1200, 600), border_radius=50)
-                    pygame.draw.rect(self.screen, "black", (500, 150, 10, 600))
-                    pygame.draw.rect(self.screen, "black", (200, 250, 1200, 10))
-
-                    self.screen.blit(self.mouseleft, [290, 270])
-                    self.screen.blit(self.wasd, [250, 400])
-                    self.screen.blit(self.arrows, [250, 570])
-                    self.screen.blit(self.ss_debris, [550, 300])
-                    self.screen.blit(self.collision, [670, 520])
-                    
-                    self.text1.draw(self.screen)
-                    self.text2.draw(self.screen)
-                    self.text3.draw(self.screen)
-                    self.text4.draw(self.screen)
-                    self.text5.draw(self.screen)
-
-
-                elif self.settings_screen:
-                    self.laser_button.draw(self.screen)
-                    self.sound_button.draw(self.screen)
-                    self.music_button.draw(self.screen)
-                    self.laser_button_text.draw(self.screen)
-                    self.sound_button_text.draw(self.screen)
-                    self.music_button_text.draw(self.screen)
-                else:
-                    self.title_text.draw(self.screen)
-                    self.run_text.draw(self.screen)
-
-                    self.upgrade_button.draw(self.screen)
+                if self.pacer.should_render(self.main_menu_layer.changed()):
+                    self.main_menu_layer.draw(self.window)
+                    pygame.display.update()
             elif self.game_state == GameState["UPGRADE_MENU"]:
                 self.change_background()
-                self.screen.blit(self.current_background, (0, 0))
                 self.point_counter.update(self.points)
-                self.point_counter.draw(self.screen)
+                if self.pacer.should_render(self.upgrade_menu_layer.changed()):
+                    self.upgrade_menu_layer.draw(self.window)
+                    pygame.display.update()
 
-                self.back_button.draw(self.screen)
-                self.draw_upgrade_cards()
+            self.scenes.update()
+            SurfaceTracker.end_frame()
 
-            pygame.display.update()
-            self.clock.tick(60)
+            if self.game_state == GameState["IN_GAME"]:
+                if self.pacer.should_render():
+                    self.renderer.present()
+                else:
+                    # a kihagyott képkocka területei nem kerülnek az előzőek közé, ezért legközelebb minden kell
+                    self.renderer.invalidate()
+            else:
+                self.renderer.invalidate()
+            if self.pacer.rendered:
+                # a kész, kirajzolt képkocka másolata; a kódolás külön folyamatban történik
+                self.capture.submit(self.window)
+            if not self.profiler.finished:
+                self.report_first_frame()
+                if self.exit_after_first_frame:
+                    running = False
+                else:
+                    # a mixer csak az első képkocka után indul, hogy ne késleltesse a megjelenést
+                    self.sound.load_music()
+                    pygame.mixer.music.play(-1)
+            self.pacer.tick(self.clock, self.game_state.name)
 
+        self.capture.stop()
         self.save()
+        if self.scene_report:
+            print(self.scenes.report())
+        if self.cpu_report:
+            print(self.pacer.report())
         pygame.quit()
 
+    def report_first_frame(self) -> None:
+        self.profiler.finish()
+        # csak --startup-profile mellett, a main() utána írja ki a szakaszonkénti bontást
+        if not self.exit_after_first_frame:
+            return
+
+        print(
+            f"Time to first frame: {self.profiler.total:.0f} ms "
+            f"(preload: {self.preloader.elapsed * 1000:.0f} ms, "
+            f"{len(self.preloader.manifest)} files, {self.preloader.workers} workers)"
+        )
+
+    def dump_memory(self) -> None:
+        print(SurfaceTracker.report())
+        print(f"render queue last frame: {self.render_queue.report()}")
+        print(f"collision broadphase: {Broadphase.report()}")
+        with open("memory_snapshot.json", "w", encoding="utf-8") as file:
+            file.write(SurfaceTracker.snapshot_json())
+
     def reset(self) -> None:
         self.player.reset()
+        Particles().clear()
 
         self.new_upgrades()
 
         self.set_game_state(GameState["MAIN_MENU"])
-        Meteorite.meteorites.empty()  # type: ignore
-        Debris.debris_group.empty()  # type: ignore
+        Meteorite.meteorites.empty()
+        Debris.debris_group.empty()
 
         self.points += self.current_points * int(
             1 + self.upgrade_manager.get_upgrade_values["ee"]
@@ -457,11 +597,26 @@ class Game:
 
         self.save()
         pygame.mixer.music.stop()
-        pygame.mixer.music.load(self.sound.all_music[self.sound.music_index])
+        self.sound.load_music()
         pygame.mixer.music.play(-1)
 
     def set_game_state(self, state: GameState) -> None:
         self.game_state = state
+        if state == GameState["UPGRADE_MENU"] and not self.upgrade_cards:
+            self.new_upgrades()
+
+        self.scenes.switch(state.name)
+        self.renderer.invalidate()
+        self.pacer.request_redraw()
+        self.prefetch_neighbours()
+
+    def prefetch_neighbours(self) -> None:
+        # a főmenüből bármelyik másik jelenet jöhet, onnan pedig csak vissza a főmenübe
+        if self.game_state == GameState["MAIN_MENU"]:
+            self.scenes.prefetch("IN_GAME")
+            self.scenes.prefetch("UPGRADE_MENU")
+        elif self.game_state == GameState["UPGRADE_MENU"]:
+            self.scenes.prefetch("MAIN_MENU")
 
     def toggle_settings_screen(self) -> None:
         self.settings_screen = not self.settings_screen
@@ -473,9 +628,62 @@ class Game:
         if self.settings_screen:
             self.settings_screen = False
 
-    def draw_upgrade_cards(self) -> None:
+    def compose_main_menu(self, surface: pygame.Surface) -> None:
+        surface.fill("black")
+        surface.blit(Game.background(self.current_background), (0, 0))
+        self.help_button.draw(surface)
+        self.settings_button.draw(surface)
+
+        if self.screen_note:
+            pygame.draw.rect(surface, "white", (200, 150, 1200, 600), border_radius=50)
+            pygame.draw.rect(surface, "black", (500, 150, 10, 600))
+            pygame.draw.rect(surface, "black", (200, 250, 1200, 10))
+
+            surface.blit(self.mouseleft, [290, 270])
+            surface.blit(self.wasd, [250, 400])
+            surface.blit(self.arrows, [250, 570])
+            surface.blit(self.ss_debris, [550, 300])
+            surface.blit(self.collision, [670, 520])
+
+            self.text1.draw(surface)
+            self.text2.draw(surface)
+            self.text3.draw(surface)
+            self.text4.draw(surface)
+            self.text5.draw(surface)
+        elif self.settings_screen:
+            self.laser_button.draw(surface)
+            self.sound_button.draw(surface)
+            self.music_button.draw(surface)
+            self.laser_button_text.draw(surface)
+            self.sound_button_text.draw(surface)
+            self.music_button_text.draw(surface)
+        else:
+            self.title_text.draw(surface)
+            self.run_text.draw(surface)
+
+            self.upgrade_button.draw(surface)
+
+    def main_menu_state(self) -> Hashable:
+        return (
+            self.current_background, self.background_opacity, self.screen_note, self.settings_screen,
+            *(button.state() for button in (self.help_button, self.settings_button, self.upgrade_button,
+                                            self.laser_button, self.sound_button, self.music_button)),
+        )
+
+    def compose_upgrade_menu(self, surface: pygame.Surface) -> None:
+        surface.fill("black")
+        surface.blit(Game.background(self.current_background), (0, 0))
+        self.point_counter.draw(surface)
+
+        self.back_button.draw(surface)
         for card in self.upgrade_cards:
-            card.draw(self.screen)
+            card.draw(surface)
+
+    def upgrade_menu_state(self) -> Hashable:
+        return (
+            self.current_background, self.background_opacity, self.point_counter.label, self.back_button.state(),
+            *((card, card.state()) for card in self.upgrade_cards),
+        )
 
     def new_upgrades(self) -> None:
         for upgrade_card in self.upgrade_cards:
@@ -529,17 +737,22 @@ class Game:
 
     @staticmethod
     def background_generate():
-        bg_surf = pygame.image.load("img/background/space.png").convert_alpha()
+        # átlátszatlan, így a visszaállított területeken nem keveredik az előző képkockával
+        bg_surf = Assets().image(Game.game_background, alpha=False)
         return bg_surf
 
+    @staticmethod
+    def background(path: str) -> pygame.Surface:
+        return Assets().image(path, alpha=False)
+
     def toggle_laser(self) -> None:
         self.laser.enabled = not self.laser.enabled
         if self.laser.enabled:
             self.laser_button.bg_color = (70, 150, 110)
-            self.next_background = self.laser_background
+            self.next_background = Game.laser_background
         else:
             self.laser_button.bg_color = (255, 81, 81)
-            self.next_background = self.default_background
+            self.next_background = Game.default_background
 
     def toggle_sound(self) -> None:
         self.sound.enabled = not self.sound.enabled
@@ -556,8 +769,7 @@ class Game:
             self.music_button.bg_color = (255, 81, 81)
 
     def change_background(self) -> None:
-        self.screen.fill("black")
-        self.current_background.set_alpha(int(255 * self.background_opacity))
+        Game.background(self.current_background).set_alpha(int(255 * self.background_opacity))
         if self.current_background == self.next_background:
             self.background_opacity += 0.3
             self.background_opacity = min(self.background_opacity, 1)
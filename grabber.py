@@ -1,16 +1,29 @@
 import math
+from collections import OrderedDict
 from enum import Enum
 
 import pygame
 
+from assets import Assets
 from collision import Collision
 from debris import Debris
+from entitystore import EntityStore
+from maskcache import MaskCache
+from memory import SurfaceTracker
+from particles import Particles
+from resolution import Resolution
 from sound import Sound
 
 ExtensionStage = Enum("ExtensionStage", ["STOPPED", "EXTENDING", "RETRACTING"])
+RenderedArm = tuple[pygame.Surface, tuple[int, int]]  # elforgatott kar, bal felső sarok a forgáspontához képest
 
 
 class Grabber:
+    length_step: int = 4  # pixel
+    direction_step: float = 2  # fok
+    max_cached: int = 1024
+    claw_radius: int = 20  # pixel, a pixelpontos ütközésnél ebből lesz a karom maszkja
+
     def __init__(self, position: pygame.Vector2) -> None:
         self.position: pygame.Vector2 = position
         self.direction: float = 0
@@ -19,9 +32,10 @@ class Grabber:
         self.extension_speed: float = 5
         self.length: float = 0
 
-        self.image: pygame.Surface = pygame.image.load(
-            "img/grabber/grabber_0.png"
-        ).convert_alpha()
+        self.level: int = 0
+        self.image: pygame.Surface = Assets().image("img/grabber/grabber_0.png")
+        # (szint, hossz indexe, irány indexe, renderelési arány) -> kész kar, csak a kép cseréjekor ürül
+        self.render_cache: OrderedDict[tuple[int, int, int, float], RenderedArm] = OrderedDict()
 
         self.max_length: int = self.image.get_height()
 
@@ -65,6 +79,7 @@ class Grabber:
         for debris in self.caught_debris:
             debris.kill()
             self.sound.play_sound(self.sound.collect)
+            Particles().collect(debris.position)
 
         self.caught_debris = []
 
@@ -86,34 +101,73 @@ class Grabber:
             self.length = self.max_length
             self.extension_stage = ExtensionStage["RETRACTING"]
 
-    def check_collect(self, debris_list: list[Debris]) -> None:
+    def check_collect(self, store: EntityStore[Debris]) -> None:
         if self.extension_stage == ExtensionStage["STOPPED"]:
             return
 
         hitbox_position: pygame.Vector2 = self.get_hitbox_position()
+        debris_list: list[Debris] = store.query_radius(hitbox_position, Grabber.claw_radius)
 
         for debris in debris_list:
-            if Collision.circle_circle_collision(
-                hitbox_position, 20, debris.position, 10
-            ):
-                if debris.caught:
+            if Collision.pixel_perfect:
+                # a karom kör marad, a törmelék a saját alakjával ütközik
+                if Grabber.claw_radius + debris.bound < hitbox_position.distance_to(debris.position):
+                    continue
+                if Collision.mask_collision(MaskCache.circle(Grabber.claw_radius), hitbox_position,
+                                            MaskCache.get(debris.image, debris.rotation), debris.position) is None:
                     continue
-                self.caught_debris.append(debris)
-                debris.caught = True
+            elif not Collision.circle_circle_collision(
+                hitbox_position, Grabber.claw_radius, debris.position, debris.radius
+            ):
+                continue
+
+            if debris.caught:
+                continue
+            self.caught_debris.append(debris)
+            debris.caught = True
 
     def rotate(self) -> None:
-        mouse_pos: tuple[int, int] = pygame.mouse.get_pos()
+        mouse_pos: tuple[int, int] = Resolution.mouse_pos()
         mouse_vec: pygame.Vector2 = pygame.Vector2(
             mouse_pos[0] - self.position.x, mouse_pos[1] - self.position.y
         )
 
         self.direction = math.degrees(math.atan2(mouse_vec.x, mouse_vec.y))
 
-    def draw(self, screen: pygame.Surface) -> None:
-        chopped_image: pygame.Surface = self.chop_image(self.max_length - self.length)
-        rotated_image, rotated_image_rect = self.get_rotated_image(chopped_image)
-
-        screen.blit(rotated_image, rotated_image_rect)
+    def draw(self, screen: pygame.Surface) -> pygame.Rect | None:
+        scale: float = Resolution.scale_of(screen)
+        rendered: RenderedArm | None = self.render(scale)
+        if rendered is None:
+            return None
+
+        rotated_image, offset = rendered
+        return screen.blit(rotated_image, (self.position.x * scale + offset[0], self.position.y * scale + offset[1]))
+
+    def render(self, scale: float = 1) -> RenderedArm | None:
+        length_index: int = round(self.length / Grabber.length_step)
+        visible_length: int = min(length_index * Grabber.length_step, self.max_length)
+        # behúzott karból nincs mit rajzolni
+        if visible_length <= 0:
+            return None
+
+        direction_index: int = round(self.direction / Grabber.direction_step) % round(360 / Grabber.direction_step)
+        key: tuple[int, int, int, float] = (self.level, length_index, direction_index, scale)
+
+        rendered: RenderedArm | None = self.render_cache.get(key)
+        if rendered is not None:
+            self.render_cache.move_to_end(key)
+            return rendered
+
+        chopped_image: pygame.Surface = self.chop_image(self.max_length - visible_length)
+        if scale != 1:
+            chopped_image = pygame.transform.smoothscale_by(chopped_image, scale)
+        rendered = self.get_rotated_image(chopped_image, direction_index * Grabber.direction_step)
+        SurfaceTracker.track(rendered[0], "sprite", "Grabber.render")
+
+        self.render_cache[key] = rendered
+        if len(self.render_cache) > Grabber.max_cached:
+            self.render_cache.popitem(last=False)
+        return rendered
 
     def get_hitbox_position(self) -> pygame.Vector2:
         return pygame.Vector2(0, self.length).rotate(-self.direction) + self.position
@@ -126,28 +180,25 @@ class Grabber:
 
         return chopped_image
 
-    def get_rotated_image(
-        self, image: pygame.Surface
-    ) -> tuple[pygame.Surface, pygame.Rect]:
-        image_rect = image.get_rect(center=(self.position.x, self.position.y))
-        offset_center_to_pivot = (
-            pygame.math.Vector2(self.position) - image_rect.midbottom
-        )
-
-        rotated_offset = offset_center_to_pivot.rotate(-self.direction)
+    @staticmethod
+    def get_rotated_image(image: pygame.Surface, direction: float) -> RenderedArm:
+        # a forgáspont az origó, így az eltolás bármelyik pozícióhoz hozzáadható
+        image_rect = image.get_rect(center=(0, 0))
+        offset_center_to_pivot = -pygame.math.Vector2(image_rect.midbottom)
 
-        rotated_image_center = (
-            self.position.x - rotated_offset.x,
-            self.position.y - rotated_offset.y,
-        )
+        rotated_offset = offset_center_to_pivot.rotate(-direction)
 
-        rotated_image = pygame.transform.rotate(image, self.direction)
-        rotated_image_rect = rotated_image.get_rect(center=rotated_image_center)
+        rotated_image = pygame.transform.rotate(image, direction)
+        rotated_image_rect = rotated_image.get_rect(center=(-rotated_offset.x, -rotated_offset.y))
 
-        return rotated_image, rotated_image_rect
+        return rotated_image, rotated_image_rect.topleft
 
     def update_length(self, length_num: int) -> None:
-        self.image = pygame.image.load(
-            f"img/grabber/grabber_{length_num}.png"
-        ).convert_alpha()
+        image: pygame.Surface = Assets().image(f"img/grabber/grabber_{length_num}.png")
+        if image is self.image:
+            return
+
+        self.level = length_num
+        self.image = image
         self.max_length = self.image.get_height()
+        self.render_cache.clear()
@@ -3,16 +3,24 @@ from typing import List, Tuple
 
 import pygame
 
+from assets import Assets
+from memory import SurfaceTracker
+from resolution import Resolution
+
 
 class Laser:
+    beam_width: int = 80
+    layer_step: int = 5
+    layer_alpha: int = 100
+
     def __init__(self, pos: Tuple[int, int], surface: pygame.Surface) -> None:
-        self.warning = pygame.image.load("./img/laser/warning.png").convert_alpha()
+        self.warning = Assets().image("./img/laser/warning.png")
         self.warning_rect = self.warning.get_rect(center=pos)
 
         self.pos: Tuple[int, int] = pos
-        self.pos2: Tuple[int, int] = (1600 - pos[0], pos[1])
+        self.pos2: Tuple[int, int] = (Resolution.logical[0] - pos[0], pos[1])
         self.pos_ver: Tuple[int, int] = pos
-        self.pos2_ver: Tuple[int, int] = (pos[0], 900 - self.pos_ver[1])
+        self.pos2_ver: Tuple[int, int] = (pos[0], Resolution.logical[1] - self.pos_ver[1])
 
         self.direction: int = 1
 
@@ -55,9 +63,9 @@ class Laser:
         self.show_warning: bool = False
         self.laser_go: bool = False
 
-        self.kill_rect: pygame.Rect = pygame.Rect((0, self.pos[1], 1600, 90))
+        self.kill_rect: pygame.Rect = pygame.Rect((0, self.pos[1], Resolution.logical[0], 90))
         self.kill_rect_ver: pygame.Rect = pygame.Rect(
-            (self.pos_ver[0] - 10, 0, 70, 900)
+            (self.pos_ver[0] - 10, 0, 70, Resolution.logical[1])
         )
 
         self.two_laser: bool = False
@@ -65,59 +73,93 @@ class Laser:
 
         self.enabled: bool = False
 
-    def update(self, screen: pygame.Surface) -> None:
+        # (szín index, függőleges-e) -> előre összerakott sugár, az első lövéskor készül el
+        self.beams: dict[tuple[int, bool], pygame.Surface] = {}
+
+    def update(self, screen: pygame.Surface) -> list[pygame.Rect | None]:
         if self.two_laser:
-            self.draw_laser(screen)
-            self.draw_warning(screen)
-            self.draw_laser_ver(screen)
-            self.draw_warning_ver(screen)
+            return [
+                self.draw_laser(screen),
+                *self.draw_warning(screen),
+                self.draw_laser_ver(screen),
+                *self.draw_warning_ver(screen),
+            ]
         else:
             if self.direction == 1:
-                self.draw_laser(screen)
-                self.draw_warning(screen)
+                return [self.draw_laser(screen), *self.draw_warning(screen)]
             else:
-                self.draw_laser_ver(screen)
-                self.draw_warning_ver(screen)
+                return [self.draw_laser_ver(screen), *self.draw_warning_ver(screen)]
 
-    def draw_warning(self, screen: pygame.Surface) -> None:
+    def draw_warning(self, screen: pygame.Surface) -> list[pygame.Rect]:
         if self.show_warning:
-            screen.blit(self.warning, self.pos)
-            screen.blit(self.warning, self.pos2)
+            return [Resolution.blit(screen, self.warning, self.pos), Resolution.blit(screen, self.warning, self.pos2)]
+        return []
 
-    def draw_warning_ver(self, screen: pygame.Surface) -> None:
+    def draw_warning_ver(self, screen: pygame.Surface) -> list[pygame.Rect]:
         if self.show_warning:
-            screen.blit(self.warning, self.pos_ver)
-            screen.blit(self.warning, self.pos2_ver)
+            return [Resolution.blit(screen, self.warning, self.pos_ver), Resolution.blit(screen, self.warning, self.pos2_ver)]
+        return []
+
+    def beam(self, vertical: bool) -> pygame.Surface:
+        key: tuple[int, bool] = (self.random_color, vertical)
+        surface: pygame.Surface | None = self.beams.get(key)
+        if surface is None:
+            surface = Laser.bake_beam(self.colors[self.random_color], vertical)
+            SurfaceTracker.track(surface, "sprite", "Laser.beam")
+            self.beams[key] = surface
+        return surface
+
+    @staticmethod
+    def bake_beam(colors: List[Tuple[int, int, int]], vertical: bool) -> pygame.Surface:
+        # A sugár egymásba ágyazott, egyre keskenyebb, átlátszó rétegekből áll. Ahol k réteg fedi egymást,
+        # ott a k réteg egymás utáni keverése pontosan egyetlen (C, A) színnel helyettesíthető:
+        # A = 1 - (1 - a)^k, C = sum(c_j * a * (1 - a)^(k - 1 - j)) / A
+        width, height = Resolution.logical
+        size: Tuple[int, int] = (Laser.beam_width, height) if vertical else (width, Laser.beam_width)
+        surface: pygame.Surface = pygame.Surface(size, pygame.SRCALPHA)
 
-    def draw_laser(self, screen: pygame.Surface) -> None:
+        alpha: float = Laser.layer_alpha / 255
+        layers: List[Tuple[int, int, int]] = colors[::-1]
+        for depth in range(1, len(layers) + 1):
+            coverage: float = 1 - (1 - alpha) ** depth
+            color: List[float] = [0, 0, 0]
+            for index in range(depth):
+                weight: float = alpha * (1 - alpha) ** (depth - 1 - index)
+                for channel in range(3):
+                    color[channel] += layers[index][channel] * weight
+            band_color: Tuple[int, int, int, int] = (
+                round(color[0] / coverage),
+                round(color[1] / coverage),
+                round(color[2] / coverage),
+                round(coverage * 255),
+            )
+
+            # a k. mélységű sáv a k. réteg két szélén lévő, layer_step széles csík (a legbelső mindent kitölt)
+            outer: int = Laser.layer_step * (depth - 1)
+            inner: int = Laser.beam_width - Laser.layer_step * (depth - 1)
+            band_width: int = Laser.layer_step if depth < len(layers) else inner - outer
+            for start in {outer, inner - band_width}:
+                band: pygame.Rect = pygame.Rect(start, 0, band_width, height) if vertical \
+                    else pygame.Rect(0, start, width, band_width)
+                surface.fill(band_color, band)
+
+        return surface
+
+    def draw_laser(self, screen: pygame.Surface) -> pygame.Rect | None:
+        rect: pygame.Rect | None = None
         if self.laser_go:
-            height: int = 80
-            pos: int = self.pos[1]
-            for color in self.colors[self.random_color][::-1]:
-                surface: pygame.Surface = pygame.Surface(
-                    (1600, height), pygame.SRCALPHA
-                )
-                pygame.draw.rect(
-                    surface, (*color, 100), pygame.Rect(0, 0, 1600, height)
-                )
-                screen.blit(surface, (0, pos))
-                pos += 5
-                height -= 10
-        self.kill_rect: pygame.Rect = pygame.Rect((0, self.pos[1] - 10, 1600, 55))
-
-    def draw_laser_ver(self, screen: pygame.Surface) -> None:
+            rect = Resolution.blit(screen, self.beam(False), (0, self.pos[1]))
+        self.kill_rect: pygame.Rect = pygame.Rect((0, self.pos[1] - 10, Resolution.logical[0], 55))
+        return rect
+
+    def draw_laser_ver(self, screen: pygame.Surface) -> pygame.Rect | None:
+        rect: pygame.Rect | None = None
         if self.laser_go:
-            width: int = 80
-            pos: int = self.pos_ver[0]
-            for color in self.colors[self.random_color][::-1]:
-                surface: pygame.Surface = pygame.Surface((width, 900), pygame.SRCALPHA)
-                pygame.draw.rect(surface, (*color, 100), pygame.Rect(0, 0, width, 900))
-                screen.blit(surface, (pos, 0))
-                pos += 5
-                width -= 10
+            rect = Resolution.blit(screen, self.beam(True), (self.pos_ver[0], 0))
         self.kill_rect_ver: pygame.Rect = pygame.Rect(
-            (self.pos_ver[0] - 10, 0, 70, 900)
+            (self.pos_ver[0] - 10, 0, 70, Resolution.logical[1])
         )
+        return rect
 
     def get_pos(self) -> None:
         self.direction: int = random.randint(1, 2)
@@ -1,10 +1,81 @@
+import argparse
+import sys
+import time
+
+from assetpack import AssetPack
+from capture import FrameCapture
+from collision import Collision
 from game import Game
+from memory import SurfaceTracker
+from preload import Preloader
+from profiler import StartupProfiler
+from rotation import RotationCache
 
 
 def main() -> None:
-    game: Game = Game()
+    started_at: float = time.perf_counter()
+
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Galactic Salvage")
+    parser.add_argument("--build-pack", nargs="?", const=AssetPack.default_path, metavar="PATH",
+                        help="pack img/, font/ and sound/ into a single asset pack and exit")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print a per-phase startup breakdown after the first frame and exit")
+    parser.add_argument("--startup-budget", type=float, default=StartupProfiler.default_budget, metavar="MS",
+                        help="with --startup-profile, exit with status 1 if startup takes longer than this")
+    parser.add_argument("--memory-budget", type=float, metavar="MIB",
+                        help="log a warning with the top offenders when surface memory exceeds this")
+    parser.add_argument("--rotation-step", type=float, default=RotationCache.step, metavar="DEGREES",
+                        help="angle step of the pre-rendered sprite rotations")
+    parser.add_argument("--rotation-cache-mib", type=float, default=RotationCache.max_bytes / 2 ** 20, metavar="MIB",
+                        help="memory cap of the sprite rotation cache")
+    parser.add_argument("--sprite-workers", type=int, default=RotationCache.workers, metavar="N",
+                        help="threads that prepare the missing sprite rotations of a frame in parallel")
+    parser.add_argument("--pixel-collisions", action="store_true",
+                        help="collide the ship and the grabber with the actual sprite shapes instead of circles")
+    parser.add_argument("--scene-report", action="store_true",
+                        help="print the peak resident memory of each scene on exit")
+    parser.add_argument("--render-scale", type=float, default=1, metavar="SCALE",
+                        help="internal resolution of the playfield relative to 1600x900, e.g. 0.5 or 0.75")
+    parser.add_argument("--full-redraw", action="store_true",
+                        help="redraw and present the whole window every frame instead of only the changed areas")
+    parser.add_argument("--always-redraw", action="store_true",
+                        help="redraw the menus every frame instead of only on input or change")
+    parser.add_argument("--pause-music-unfocused", action="store_true",
+                        help="pause the music while the window is minimised or unfocused")
+    parser.add_argument("--cpu-report", action="store_true",
+                        help="print the CPU usage and frame rate of each game state on exit")
+    parser.add_argument("--capture", action="store_true",
+                        help="record every drawn frame from the start (F9 toggles recording while playing)")
+    parser.add_argument("--capture-dir", default=FrameCapture.default_directory, metavar="DIR",
+                        help="directory of the recordings, one subdirectory per session")
+    parser.add_argument("--capture-format", choices=FrameCapture.formats, default=FrameCapture.formats[0],
+                        help="raw: a single rgb24 video file, bmp or png: a numbered image sequence")
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.build_pack:
+        count: int = AssetPack.build(args.build_pack, Preloader.build_manifest(include_music=True))
+        print(f"Packed {count} files into {args.build_pack}")
+        return
+
+    RotationCache.configure(step=args.rotation_step, max_bytes=int(args.rotation_cache_mib * 2 ** 20),
+                            workers=args.sprite_workers)
+    Collision.pixel_perfect = args.pixel_collisions
+    if args.memory_budget is not None:
+        SurfaceTracker.budget = int(args.memory_budget * 2 ** 20)
+
+    profiler: StartupProfiler = StartupProfiler(started_at)
+    game: Game = Game(profiler, exit_after_first_frame=args.startup_profile, scene_report=args.scene_report,
+                      dirty_rects=not args.full_redraw, render_scale=args.render_scale,
+                      on_demand=not args.always_redraw, pause_music=args.pause_music_unfocused,
+                      cpu_report=args.cpu_report, capture=FrameCapture(args.capture_dir, args.capture_format),
+                      start_capture=args.capture)
     game.run()
 
+    if args.startup_profile:
+        print(profiler.report(args.startup_budget))
+        if not profiler.within_budget(args.startup_budget):
+            sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,54 @@
+from collections import OrderedDict
+
+import pygame
+
+from rotation import RotationCache
+
+PositionedMask = tuple[pygame.mask.Mask, tuple[int, int]]  # maszk, bal felső sarok a középponthoz képest
+
+
+class MaskCache:
+    max_entries: int = 2048
+
+    # (forrás kép, szög indexe) -> a logikai méretű, elforgatott kép maszkja; a szögeket ugyanúgy kvantáljuk,
+    # mint a kirajzolt forgatásokat, így a maszk pontosan a látott képet fedi
+    cache: "OrderedDict[tuple[pygame.Surface, int], PositionedMask]" = OrderedDict()
+    circles: dict[int, pygame.mask.Mask] = {}
+
+    hits: int = 0
+    misses: int = 0
+
+    @staticmethod
+    def clear() -> None:
+        MaskCache.cache.clear()
+
+    @staticmethod
+    def get(source: pygame.Surface, angle: float) -> PositionedMask:
+        steps: int = round(360 / RotationCache.step)
+        index: int = round(angle / RotationCache.step) % steps
+        key: tuple[pygame.Surface, int] = (source, index)
+
+        entry: PositionedMask | None = MaskCache.cache.get(key)
+        if entry is not None:
+            MaskCache.hits += 1
+            MaskCache.cache.move_to_end(key)
+            return entry
+
+        MaskCache.misses += 1
+        # a forgatott képre csak a maszkhoz van szükség, nem kerül a forgatási cache-be
+        rotated, offset = RotationCache.rotate(source, index * RotationCache.step)
+        entry = (pygame.mask.from_surface(rotated), offset)
+
+        MaskCache.cache[key] = entry
+        if len(MaskCache.cache) > MaskCache.max_entries:
+            MaskCache.cache.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def circle(radius: int) -> PositionedMask:
+        mask: pygame.mask.Mask | None = MaskCache.circles.get(radius)
+        if mask is None:
+            surface: pygame.Surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, "white", (radius, radius), radius)
+            mask = MaskCache.circles[radius] = pygame.mask.from_surface(surface)
+        return mask, (-radius, -radius)
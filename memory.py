@@ -0,0 +1,118 @@
+import json
+import logging
+import weakref
+from collections import defaultdict
+from typing import Any
+
+import pygame
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class SurfaceTracker:
+    categories: tuple[str, ...] = ("background", "sprite", "animation", "transient", "text", "ui")
+
+    # élő felületek: felület -> (kategória, címke); a felület felszabadulásakor magától törlődik
+    surfaces: "weakref.WeakKeyDictionary[pygame.Surface, tuple[str, str]]" = weakref.WeakKeyDictionary()
+
+    # a képkockánként létrehozott és eldobott felületeket (pl. forgatás) csak számoljuk
+    frame_transient: dict[str, int] = defaultdict(int)
+    last_frame_transient: dict[str, int] = {}
+    peak_frame_transient: int = 0
+
+    budget: int | None = None  # byte, None = nincs figyelés
+    budget_check_interval: int = 60  # képkockánként
+    top_offenders: int = 5
+    frame: int = 0
+    over_budget: bool = False
+
+    @staticmethod
+    def track(surface: pygame.Surface, category: str, label: str) -> pygame.Surface:
+        SurfaceTracker.surfaces[surface] = (category, label)
+        return surface
+
+    @staticmethod
+    def transient(surface: pygame.Surface, label: str) -> pygame.Surface:
+        SurfaceTracker.frame_transient[label] += SurfaceTracker.byte_size(surface)
+        return surface
+
+    @staticmethod
+    def byte_size(surface: pygame.Surface) -> int:
+        return surface.get_pitch() * surface.get_height()
+
+    @staticmethod
+    def end_frame() -> None:
+        SurfaceTracker.last_frame_transient = dict(SurfaceTracker.frame_transient)
+        SurfaceTracker.peak_frame_transient = max(SurfaceTracker.peak_frame_transient,
+                                                  sum(SurfaceTracker.last_frame_transient.values()))
+        SurfaceTracker.frame_transient.clear()
+
+        SurfaceTracker.frame += 1
+        if SurfaceTracker.frame % SurfaceTracker.budget_check_interval == 0:
+            SurfaceTracker.check_budget()
+
+    @staticmethod
+    def snapshot() -> dict[str, Any]:
+        by_category: dict[str, int] = {category: 0 for category in SurfaceTracker.categories}
+        counts: dict[str, int] = {category: 0 for category in SurfaceTracker.categories}
+        by_label: dict[tuple[str, str], int] = defaultdict(int)
+
+        for surface, (category, label) in list(SurfaceTracker.surfaces.items()):
+            size: int = SurfaceTracker.byte_size(surface)
+            by_category[category] += size
+            counts[category] += 1
+            by_label[(category, label)] += size
+
+        for label, size in SurfaceTracker.last_frame_transient.items():
+            by_category["transient"] += size
+            by_label[("transient", label)] += size
+
+        offenders: list[tuple[tuple[str, str], int]] = sorted(by_label.items(), key=lambda item: item[1],
+                                                              reverse=True)
+        return {
+            "total_bytes": sum(by_category.values()),
+            "budget_bytes": SurfaceTracker.budget,
+            "categories": {
+                category: {"bytes": by_category[category], "surfaces": counts[category]}
+                for category in SurfaceTracker.categories
+            },
+            "transient_peak_frame_bytes": SurfaceTracker.peak_frame_transient,
+            "top": [
+                {"category": category, "label": label, "bytes": size}
+                for (category, label), size in offenders[:SurfaceTracker.top_offenders]
+            ],
+        }
+
+    @staticmethod
+    def snapshot_json() -> str:
+        return json.dumps(SurfaceTracker.snapshot(), indent=2)
+
+    @staticmethod
+    def report() -> str:
+        snapshot: dict[str, Any] = SurfaceTracker.snapshot()
+        lines: list[str] = [f"{'category':<12} {'surfaces':>8} {'MiB':>9}"]
+        for category, values in snapshot["categories"].items():
+            lines.append(f"{category:<12} {values['surfaces']:>8} {values['bytes'] / 2 ** 20:>9.2f}")
+        lines.append(f"{'total':<12} {'':>8} {snapshot['total_bytes'] / 2 ** 20:>9.2f}")
+        lines.append("top offenders:")
+        for offender in snapshot["top"]:
+            lines.append(f"  {offender['category']:<12} {offender['bytes'] / 2 ** 20:>9.2f}  {offender['label']}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def check_budget() -> None:
+        if SurfaceTracker.budget is None:
+            return
+
+        snapshot: dict[str, Any] = SurfaceTracker.snapshot()
+        over_budget: bool = snapshot["total_bytes"] > SurfaceTracker.budget
+        # csak a túllépés kezdetén figyelmeztetünk, nem minden ellenőrzéskor
+        if over_budget and not SurfaceTracker.over_budget:
+            logger.warning(
+                "Surface memory %.1f MiB is over the %.1f MiB budget; top offenders: %s",
+                snapshot["total_bytes"] / 2 ** 20,
+                SurfaceTracker.budget / 2 ** 20,
+                ", ".join(f"{offender['label']} ({offender['bytes'] / 2 ** 20:.1f} MiB)"
+                          for offender in snapshot["top"]),
+            )
+        SurfaceTracker.over_budget = over_budget
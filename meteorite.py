@@ -1,53 +1,26 @@
 import math
 import random
-import typing
 
 import pygame
 
+from assets import Assets
+from entitystore import Entity, EntityStore
 
-class Meteorite(pygame.sprite.Sprite):
-    meteorites: pygame.sprite.Group = pygame.sprite.Group()  # type: ignore
 
-    def __init__(self, pos: pygame.Vector2, direction: float, speed: float, radius: int) -> None:
-        super().__init__()
+class Meteorite(Entity):
+    # a pozíciók, sebességek és forgások egy tömbben, a léptetés és a kiesők szűrése egyben történik
+    meteorites: "EntityStore[Meteorite]" = EntityStore()
 
-        self.position: pygame.Vector2 = pos
+    def __init__(self, pos: pygame.Vector2, direction: float, speed: float, radius: int) -> None:
         self.radius: int = radius - 10
         self.direction: float = direction
         self.velocity: float = speed
 
-        self.rotation_speed: float = 0.1
-        self.rotation: float = 0
-
-        self.image: pygame.Surface = pygame.image.load("img/meteorite/meteorite.png").convert_alpha()
-        self.image = pygame.transform.scale(self.image, (radius * 2, radius * 2))
-
-    def update(self, *args: typing.Any, **kwargs: typing.Any) -> None:
-        screen: pygame.Surface = kwargs["screen"]
-
-        self.move()
-        self.rotate()
-        self.check_outside(screen.get_size())
-
-        self.draw(screen)
-
-    def check_outside(self, screen_resolution: tuple[int, int]) -> None:
-        if self.position.x < 0 - self.radius * 2 or self.position.x > screen_resolution[0] + self.radius * 2 or \
-                self.position.y < 0 - self.radius * 2 or self.position.y > screen_resolution[1] + self.radius * 2:
-            self.kill()
-
-    def move(self) -> None:
-        self.position += pygame.Vector2(0, self.velocity).rotate(-self.direction)
-
-    def rotate(self) -> None:
-        self.rotation += self.rotation_speed
-        self.rotation %= 360
-
-    def draw(self, screen: pygame.Surface) -> None:
-        rotated_image: pygame.Surface = pygame.transform.rotate(self.image, self.rotation)
-        rotated_rect: pygame.Rect = rotated_image.get_rect(center=self.image.get_rect(center=self.position).center)
+        self.image: pygame.Surface = Assets().scaled("img/meteorite/meteorite.png", (radius * 2, radius * 2))
 
-        screen.blit(rotated_image, rotated_rect.topleft)
+        # a meteorit kerek, a kép sarkai átlátszók, így forgatva is ezen a körön belül marad, ami látszik
+        super().__init__(pos, pygame.Vector2(0, speed).rotate(-direction), 0.1, self.radius * 2,
+                         self.image.get_width() / 2, self.radius)
 
     @staticmethod
     def create_random(screen_resolution: tuple[int, int]) -> None:
@@ -56,7 +29,7 @@ class Meteorite(pygame.sprite.Sprite):
         direction: float = Meteorite.create_random_direction(screen_resolution, position)
         speed: float = random.random() * 2 + 1
 
-        Meteorite.meteorites.add(Meteorite(position, direction, speed, radius))  # type: ignore
+        Meteorite.meteorites.add(Meteorite(position, direction, speed, radius))
 
     @staticmethod
     def create_random_direction(screen_resolution: tuple[int, int], position: pygame.Vector2) -> float:
@@ -0,0 +1,143 @@
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pygame
+
+from resolution import Resolution
+
+
+class Particles(object):
+    _instance: Any = None
+    _initialized: bool = False
+
+    capacity: int = 16384  # efölött a legrövidebb hátralévő életű részecskék adják át a helyüket
+    size: int = 2  # pixel, logikai felbontásban
+    drag: float = 0.96
+
+    explosion_colors: tuple[tuple[int, int, int], ...] = ((255, 240, 200), (255, 196, 64), (255, 120, 32), (200, 40, 16))
+    impact_colors: tuple[tuple[int, int, int], ...] = ((170, 150, 130), (120, 105, 95), (220, 200, 170))
+    thrust_colors: tuple[tuple[int, int, int], ...] = ((255, 255, 220), (255, 210, 90), (255, 140, 40))
+    collect_colors: tuple[tuple[int, int, int], ...] = ((140, 255, 220), (60, 220, 255), (255, 255, 255))
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "Particles":
+        if cls._instance is None:
+            cls._instance = super(Particles, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if self._initialized:
+            return
+        self._initialized = True
+
+        # az élő részecskék mindig a tömbök elején, egymás után vannak
+        self.count: int = 0
+        self.position: npt.NDArray[np.float32] = np.zeros((Particles.capacity, 2), np.float32)
+        self.velocity: npt.NDArray[np.float32] = np.zeros((Particles.capacity, 2), np.float32)
+        self.life: npt.NDArray[np.float32] = np.zeros(Particles.capacity, np.float32)
+        self.max_life: npt.NDArray[np.float32] = np.ones(Particles.capacity, np.float32)
+        self.color: npt.NDArray[np.float32] = np.zeros((Particles.capacity, 3), np.float32)
+
+        self.random: np.random.Generator = np.random.default_rng()
+        self.dropped: int = 0
+
+    def clear(self) -> None:
+        self.count = 0
+
+    def emit(self, position: pygame.Vector2 | tuple[float, float], count: int, speed: tuple[float, float],
+             life: tuple[int, int], colors: tuple[tuple[int, int, int], ...], direction: float = 0,
+             spread: float = 360) -> None:
+        count = self.make_room(count)
+        if count == 0:
+            return
+
+        start: int = self.count
+        end: int = start + count
+        # az irány a játék többi részéhez hasonlóan fokban, Vector2(0, 1).rotate(-direction) szerint
+        angles: npt.NDArray[np.float64] = np.radians(direction + self.random.uniform(-spread / 2, spread / 2, count))
+        speeds: npt.NDArray[np.float64] = self.random.uniform(speed[0], speed[1], count)
+
+        self.position[start:end] = (position[0], position[1])
+        self.velocity[start:end, 0] = np.sin(angles) * speeds
+        self.velocity[start:end, 1] = np.cos(angles) * speeds
+        self.life[start:end] = self.random.integers(life[0], life[1], count, endpoint=True)
+        self.max_life[start:end] = self.life[start:end]
+        self.color[start:end] = np.array(colors, np.float32)[self.random.integers(0, len(colors), count)]
+
+        self.count = end
+
+    def make_room(self, count: int) -> int:
+        count = min(count, Particles.capacity)
+        overflow: int = self.count + count - Particles.capacity
+        if overflow > 0:
+            # telítettségnél a régi, hamarosan amúgy is eltűnő részecskéket dobjuk el, az új robbanás látsszon
+            keep: npt.NDArray[np.bool_] = np.ones(self.count, np.bool_)
+            keep[np.argpartition(self.life[:self.count], overflow - 1)[:overflow]] = False
+            self.compact(keep)
+            self.dropped += overflow
+        return count
+
+    def compact(self, keep: npt.NDArray[np.bool_]) -> None:
+        alive: int = int(keep.sum())
+        for array in (self.position, self.velocity, self.life, self.max_life, self.color):
+            array[:alive] = array[:self.count][keep]
+        self.count = alive
+
+    def update(self) -> None:
+        if self.count == 0:
+            return
+
+        count: int = self.count
+        self.position[:count] += self.velocity[:count]
+        self.velocity[:count] *= Particles.drag
+        self.life[:count] -= 1
+
+        alive: npt.NDArray[np.bool_] = self.life[:count] > 0
+        if not alive.all():
+            self.compact(alive)
+
+    def draw(self, screen: pygame.Surface) -> pygame.Rect | None:
+        if self.count == 0:
+            return None
+
+        count: int = self.count
+        scale: float = Resolution.scale_of(screen)
+        size: int = max(1, round(Particles.size * scale))
+        width, height = screen.get_size()
+
+        xs: npt.NDArray[np.intp] = (self.position[:count, 0] * scale).astype(np.intp)
+        ys: npt.NDArray[np.intp] = (self.position[:count, 1] * scale).astype(np.intp)
+        visible: npt.NDArray[np.bool_] = (xs >= 0) & (ys >= 0) & (xs <= width - size) & (ys <= height - size)
+        if not visible.any():
+            return None
+        xs, ys = xs[visible], ys[visible]
+
+        # a halványodó részecske az élete arányában keveredik a háttérrel
+        alpha: npt.NDArray[np.float32] = (self.life[:count] / self.max_life[:count])[visible, None]
+        colors: npt.NDArray[np.float32] = self.color[:count][visible]
+
+        pixels: npt.NDArray[np.uint8] = pygame.surfarray.pixels3d(screen)
+        # a keverést a bal felső pixel alapján egyszer számoljuk, a részecske összes pixelére ugyanaz kerül
+        background: npt.NDArray[np.float32] = pixels[xs, ys].astype(np.float32)
+        blended: npt.NDArray[np.float32] = background + (colors - background) * alpha
+        for dx in range(size):
+            for dy in range(size):
+                pixels[xs + dx, ys + dy] = blended
+        # a felület zárolása a tömb felszabadításáig tart
+        del pixels
+
+        left: int = int(xs.min())
+        top: int = int(ys.min())
+        return pygame.Rect(left, top, int(xs.max()) - left + size, int(ys.max()) - top + size)
+
+    def explosion(self, position: pygame.Vector2) -> None:
+        self.emit(position, 400, (1, 7), (30, 70), Particles.explosion_colors)
+
+    def impact(self, position: pygame.Vector2) -> None:
+        self.emit(position, 60, (0.5, 3), (20, 45), Particles.impact_colors)
+
+    def thrust(self, position: pygame.Vector2, direction: float) -> None:
+        self.emit(position, 6, (1.5, 3.5), (8, 20), Particles.thrust_colors, direction, 30)
+
+    def collect(self, position: pygame.Vector2) -> None:
+        self.emit(position, 40, (0.5, 2.5), (15, 35), Particles.collect_colors)
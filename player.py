@@ -4,9 +4,15 @@ from copy import copy
 import pygame
 
 from animation import Animation
+from assets import Assets
 from collision import Collision
+from entitystore import EntityStore
 from grabber import Grabber
+from maskcache import MaskCache, PositionedMask
 from meteorite import Meteorite
+from particles import Particles
+from resolution import Resolution
+from rotation import RotationCache
 from sound import Sound
 
 
@@ -24,6 +30,47 @@ def map_value_to_range(
     return (value - start1) * difference + start2
 
 
+class ShipGeometry:
+    # a hajó téglalapja a középpont körül, a get_verticies korábbi sorrendjében
+    corner_signs: tuple[tuple[int, int], ...] = ((1, 1), (1, -1), (-1, -1), (-1, 1))
+
+    def __init__(self) -> None:
+        self.size: tuple[int, int] = (0, 0)
+        self.half_size: tuple[float, float] = (0, 0)
+        self.corners: list[pygame.Vector2] = []  # forgatás nélkül, a középponthoz képest
+        self.bound: float = 0  # a téglalap köré írt kör sugara
+
+        self.key: tuple[float, float, float] | None = None  # pozíció és irány, amihez a csúcsok készültek
+        self.rotation: float = 0  # ennyivel vannak elforgatva a sarkok
+        self.verticies: list[pygame.Vector2] = []
+
+        self.rebuilds: int = 0
+
+    def update(self, size: tuple[int, int], position: pygame.Vector2, direction: float) -> "ShipGeometry":
+        # az animáció képkockái ugyanakkorák, így a méret csak a hajó cseréjekor változik
+        if size != self.size:
+            self.size = size
+            self.half_size = (size[0] / 2, size[1] / 2)
+            self.corners = [pygame.Vector2(self.half_size[0] * x, self.half_size[1] * y)
+                            for x, y in ShipGeometry.corner_signs]
+            self.bound = math.hypot(*self.half_size)
+            self.key = None
+
+        # a pozíció helyben változik, ezért értékre hasonlítunk
+        key: tuple[float, float, float] = (position.x, position.y, direction)
+        if key != self.key:
+            self.key = key
+            self.rotation = -direction
+            # egy szinusz és koszinusz a négy sarokhoz
+            angle: float = math.radians(self.rotation)
+            cos: float = math.cos(angle)
+            sin: float = math.sin(angle)
+            self.verticies = [pygame.Vector2(position.x + corner.x * cos - corner.y * sin,
+                                             position.y + corner.x * sin + corner.y * cos) for corner in self.corners]
+            self.rebuilds += 1
+        return self
+
+
 class Player:
     def __init__(self, x: int, y: int, direction: float) -> None:
         self.starting_position: pygame.Vector2 = pygame.Vector2(x, y)
@@ -46,9 +93,7 @@ class Player:
             "img/explosion.png", 224, 224, 0.2, False
         )
 
-        self.shield_image: pygame.Surface = pygame.image.load(
-            "img/spaceship/shield/shield.png"
-        ).convert_alpha()
+        self.shield_image: pygame.Surface = Assets().image("img/spaceship/shield/shield.png")
         self.shield_visibility_duration: float = 30  # in frames (60 frames per second)
         self.shield_visible: float = 0
         self.shield_break_animation: Animation = Animation.import_spritesheet(
@@ -66,8 +111,11 @@ class Player:
 
         self.dead = False
         self.last_meteorite_hit: Meteorite | None = None
+        # pixelpontos ütközésnél a maszkok első közös pontja
+        self.last_hit_point: pygame.Vector2 | None = None
 
         self.prev_call: float = 0
+        self.geometry: ShipGeometry = ShipGeometry()
 
         self.sound = Sound()
 
@@ -87,25 +135,21 @@ class Player:
         self.shield_break_animation.reset()
         self.shield_visible = 0
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface) -> list[pygame.Rect | None]:
         if self.dead:
-            self.death_animation.draw_next(screen, self.position)
-            return
+            return [self.death_animation.draw_next(screen, self.position)]
 
         if self.image is None:
-            return
+            return []
 
-        self.grabber.draw(screen)
+        grabber_rect: pygame.Rect | None = self.grabber.draw(screen)
 
-        rotated_image: pygame.Surface = pygame.transform.rotate(
-            self.image, self.direction
-        )
-        rotated_rect: pygame.Rect = rotated_image.get_rect(
-            center=self.image.get_rect(center=self.position).center
-        )
+        scale: float = Resolution.scale_of(screen)
+        rotated_image, offset = RotationCache.get(self.image, self.direction, scale)
 
-        screen.blit(rotated_image, rotated_rect)
-        self.draw_shield(screen)
+        ship_rect: pygame.Rect = screen.blit(rotated_image, (self.position.x * scale + offset[0],
+                                                             self.position.y * scale + offset[1]))
+        return [grabber_rect, ship_rect, self.draw_shield(screen)]
 
     def update(self) -> int:
         self.animate()
@@ -125,6 +169,9 @@ class Player:
         self.velocity = self.velocity.clamp_magnitude(self.max_velocity)
         self.moving = True
 
+        # a hajtómű a hajó hátulján, a menetiránnyal szemben fúj
+        Particles().thrust(self.position + pygame.Vector2(0, 45).rotate(-self.direction), self.direction)
+
     def slow_down(self) -> None:
         if self.can_slow_down:
             self.velocity *= 1 - self.deceleration
@@ -146,56 +193,57 @@ class Player:
 
         self.moving = False
 
+    def get_geometry(self) -> ShipGeometry:
+        return self.geometry.update(self.resolution, self.position, self.direction)
+
     def get_verticies(self) -> list[pygame.Vector2]:
         if self.image is None:
             return []
+        return self.get_geometry().verticies
 
-        width: int = self.image.get_width()
-        height: int = self.image.get_height()
-
-        verticies: list[pygame.Vector2] = []
-        for i in range(4):
-            binary: str = format(i, "b").zfill(2)
-            verticies.append(
-                pygame.Vector2(
-                    (width / 2) * (1 if binary[0] == "0" else -1),
-                    (height / 2) * (1 if binary[1] == "0" else -1),
-                ).rotate(-self.direction)
-                + self.position
-            )
+    def check_collision(self, store: EntityStore[Meteorite]) -> bool:
+        if self.image is None:
+            return False
 
-        verticies[-1], verticies[-2] = verticies[-2], verticies[-1]
-        return verticies
+        # csak a hajó elforgatott téglalapjába belógó meteoritok jönnek szóba
+        geometry: ShipGeometry = self.get_geometry()
+        if Collision.pixel_perfect:
+            return self.check_pixel_collision(
+                store.query_obb(self.position, geometry.half_size, geometry.rotation)
+            )
 
-    def check_collision(self, meteorites: list[Meteorite]) -> bool:
-        if self.image is None:
+        hits: list[Meteorite] = store.collide_obb(self.position, geometry.half_size, geometry.rotation)
+        if not hits:
             return False
+        self.last_meteorite_hit = hits[0]
+        return True
 
-        verticies: list[pygame.Vector2] = self.get_verticies()
+    def check_pixel_collision(self, meteorites: list[Meteorite]) -> bool:
+        assert self.image is not None
+        reach: float = self.get_geometry().bound
+        ship_mask: PositionedMask | None = None
         for meteorite in meteorites:
-            if (
-                meteorite.radius
-                + math.sqrt(
-                    (self.image.get_width() / 2) ** 2
-                    + (self.image.get_height() / 2) ** 2
-                )
-                < (self.position - meteorite.position).magnitude()
-            ):
+            # olcsó elutasítás a teljes képek köré írt körökkel, maszk csak a közeli meteoritokhoz kell
+            if meteorite.bound + reach < self.position.distance_to(meteorite.position):
                 continue
 
-            if Collision.rectangle_circle_collision(
-                self.position, verticies, meteorite.position, meteorite.radius
-            ):
+            if ship_mask is None:
+                ship_mask = MaskCache.get(self.image, self.direction)
+            contact: pygame.Vector2 | None = Collision.mask_collision(
+                ship_mask, self.position, MaskCache.get(meteorite.image, meteorite.rotation), meteorite.position
+            )
+            if contact is not None:
                 self.last_meteorite_hit = meteorite
+                self.last_hit_point = contact
                 return True
 
         return False
 
     def out_screen(self) -> None:
         if (
-            self.position.x > 1600
+            self.position.x > Resolution.logical[0]
             or self.position.x < 0
-            or self.position.y > 900
+            or self.position.y > Resolution.logical[1]
             or self.position.y < 0
         ):
             self.die()
@@ -207,6 +255,12 @@ class Player:
         if self.shield == 0:
             self.die()
 
+        if self.last_hit_point is not None:
+            Particles().impact(self.last_hit_point)
+        elif self.last_meteorite_hit is not None:
+            meteorite: Meteorite = self.last_meteorite_hit
+            Particles().impact(meteorite.position + (self.position - meteorite.position).normalize() * meteorite.radius)
+        self.last_hit_point = None
         self.bounce_off_meteorite(self.last_meteorite_hit)
         self.shield -= 1
         self.show_shield()
@@ -215,6 +269,7 @@ class Player:
         if not self.dead:
             self.dead = True
             self.sound.play_sound(self.sound.explosion)
+            Particles().explosion(self.position)
 
     def check_kill_collision(
         self, kill_rect: pygame.Rect, kill_rect_ver: pygame.Rect, direction: int
@@ -265,23 +320,26 @@ class Player:
     def show_shield(self) -> None:
         self.shield_visible = copy(self.shield_visibility_duration)
 
-    def draw_shield(self, screen: pygame.Surface) -> None:
+    def draw_shield(self, screen: pygame.Surface) -> pygame.Rect | None:
         if self.shield_visible <= 0:
             self.shield_visible = 0
-            return
+            return None
 
         if self.shield == 0:
-            self.shield_break_animation.draw_next(screen, self.position)
+            rect: pygame.Rect | None = self.shield_break_animation.draw_next(screen, self.position)
             self.shield_visible -= 1
-            return
+            return rect
 
-        self.shield_image.set_alpha(
+        scale: float = Resolution.scale_of(screen)
+        shield_image: pygame.Surface = Resolution.scaled(self.shield_image, scale)
+        shield_image.set_alpha(
             int(
                 map_value_to_range(
                     self.shield_visible, 0, 255, 0, self.shield_visibility_duration
                 )
             )
         )
-        shield_rect: pygame.Rect = self.shield_image.get_rect(center=self.position)
-        screen.blit(self.shield_image, shield_rect)
+        shield_rect: pygame.Rect = shield_image.get_rect(center=Resolution.point(self.position, scale))
+        screen.blit(shield_image, shield_rect)
         self.shield_visible -= 1
+        return shield_rect
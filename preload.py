@@ -0,0 +1,108 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+import pygame
+
+from assetpack import AssetPack
+from assets import Assets
+from sound import Sound
+
+
+class Preloader:
+    directories: tuple[str, ...] = ("img", "font", "sound")
+    kinds: dict[str, str] = {
+        ".png": "image",
+        ".ttf": "font",
+        ".otf": "font",
+        ".mp3": "sound",
+    }
+
+    def __init__(self, screen: pygame.Surface, workers: int | None = None) -> None:
+        self.screen: pygame.Surface = screen
+        self.workers: int = workers or min(8, os.cpu_count() or 1)
+
+        # a hangeffekteket a Sound tölti be, amikor a mixer elindul
+        self.manifest: list[tuple[str, str]] = [
+            (path, kind) for path, kind in Preloader.pack_manifest() or Preloader.build_manifest()
+            if kind != "sound"
+        ]
+        self.loaded: int = 0
+        self.elapsed: float = 0
+
+        self.font: pygame.font.Font = Assets().font(None, 40)
+
+    @staticmethod
+    def build_manifest(include_music: bool = False) -> list[tuple[str, str]]:
+        manifest: list[tuple[str, str]] = []
+        for directory in Preloader.directories:
+            for root, _, files in os.walk(directory):
+                for file in files:
+                    path: str = Assets.normalize(os.path.join(root, file))
+                    kind: str | None = Preloader.kinds.get(os.path.splitext(file)[1].lower())
+                    if kind is None:
+                        continue
+                    # a zenét a mixer streameli, azt nem kell előre dekódolni
+                    if path in Sound.music_files:
+                        if not include_music:
+                            continue
+                        kind = "music"
+                    manifest.append((path, kind))
+
+        # a nagy fájlok induljanak először, hogy ne rájuk várjunk a végén
+        manifest.sort(key=lambda item: os.path.getsize(item[0]), reverse=True)
+        return manifest
+
+    @staticmethod
+    def pack_manifest() -> list[tuple[str, str]]:
+        pack: AssetPack | None = Assets().pack
+        if pack is None:
+            return []
+
+        return [(path, entry["kind"]) for path, entry in pack.index.items() if entry["kind"] != "music"]
+
+    @staticmethod
+    def decode(path: str, kind: str) -> pygame.Surface | pygame.mixer.Sound | bytes:
+        return Assets().decode(path, kind)
+
+    def run(self) -> None:
+        start: float = time.perf_counter()
+
+        with ThreadPoolExecutor(self.workers) as executor:
+            pending: dict[Future[pygame.Surface | pygame.mixer.Sound | bytes], tuple[str, str]] = {
+                executor.submit(Preloader.decode, path, kind): (path, kind) for path, kind in self.manifest
+            }
+
+            while pending:
+                done, _ = wait(pending, timeout=1 / 60, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, kind = pending.pop(future)
+                    self.loaded += 1
+                    try:
+                        data: pygame.Surface | pygame.mixer.Sound | bytes = future.result()
+                    except (pygame.error, OSError):
+                        # hibás fájl: majd az első használatkor derül ki, ha tényleg kell
+                        continue
+                    # a kijelző formátumára konvertálás csak a fő szálon mehet
+                    Assets().add_decoded(path, kind, data)
+
+                pygame.event.pump()
+                self.draw()
+
+        self.elapsed = time.perf_counter() - start
+
+    def draw(self) -> None:
+        width, height = self.screen.get_size()
+        progress: float = self.loaded / len(self.manifest) if self.manifest else 1
+
+        self.screen.fill("black")
+
+        text: pygame.Surface = self.font.render("Betöltés...", True, "white")
+        self.screen.blit(text, text.get_rect(center=(width // 2, height // 2 - 50)))
+
+        bar: pygame.Rect = pygame.Rect(0, 0, 600, 30)
+        bar.center = (width // 2, height // 2)
+        pygame.draw.rect(self.screen, "white", bar, 2)
+        pygame.draw.rect(self.screen, "white", (bar.x, bar.y, int(bar.width * progress), bar.height))
+
+        pygame.display.update()
@@ -0,0 +1,41 @@
+import time
+
+
+class StartupProfiler:
+    default_budget: float = 1000  # ms, a main()-től az első képkockáig
+
+    def __init__(self, started_at: float | None = None) -> None:
+        self.started_at: float = started_at if started_at is not None else time.perf_counter()
+        self.last_mark: float = self.started_at
+        self.phases: list[tuple[str, float]] = []
+        self.finished: bool = False
+
+    @property
+    def total(self) -> float:
+        return (self.last_mark - self.started_at) * 1000
+
+    def mark(self, phase: str) -> None:
+        if self.finished:
+            return
+
+        now: float = time.perf_counter()
+        self.phases.append((phase, (now - self.last_mark) * 1000))
+        self.last_mark = now
+
+    def finish(self) -> None:
+        self.mark("first frame")
+        self.finished = True
+
+    def within_budget(self, budget: float) -> bool:
+        return self.total <= budget
+
+    def report(self, budget: float | None = None) -> str:
+        width: int = max((len(phase) for phase, _ in self.phases), default=0)
+        lines: list[str] = [f"{phase.ljust(width)}  {duration:8.1f} ms" for phase, duration in self.phases]
+        lines.append(f"{'total'.ljust(width)}  {self.total:8.1f} ms")
+
+        if budget is not None:
+            verdict: str = "OK" if self.within_budget(budget) else "OVER BUDGET"
+            lines.append(f"budget {budget:.0f} ms: {verdict}")
+
+        return "\n".join(lines)
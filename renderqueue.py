@@ -0,0 +1,74 @@
+from collections import defaultdict
+from enum import Enum
+
+import pygame
+
+from resolution import Resolution
+from rotation import RotatedSurface, RotationCache, RotationKey
+
+RenderLayer = Enum("RenderLayer", ["METEORITE", "DEBRIS"])
+RenderItem = tuple[pygame.Surface, tuple[float, float]]
+RotatedItem = tuple[pygame.Surface, float, tuple[float, float], RenderLayer]  # forrás, szög, logikai középpont, réteg
+
+
+class RenderQueue:
+    def __init__(self, screen: pygame.Surface) -> None:
+        self.screen: pygame.Surface = screen
+        self.scale: float = Resolution.scale_of(screen)
+        self.width: int = screen.get_width()
+        self.height: int = screen.get_height()
+
+        self.layers: defaultdict[RenderLayer, list[RenderItem]] = defaultdict(list)
+        # a forgatásra váró elemek; a képük csak a flush előkészítő lépésében készül el
+        self.rotated: list[RotatedItem] = []
+
+        self.submitted: int = 0
+        self.culled: int = 0
+        self.last_frame: dict[str, int] = {"submitted": 0, "culled": 0, "drawn": 0}
+
+    def cull(self, count: int = 1) -> None:
+        self.submitted += count
+        self.culled += count
+
+    def submit(self, surface: pygame.Surface, position: tuple[float, float], layer: RenderLayer) -> None:
+        self.submitted += 1
+        width, height = surface.get_size()
+        if position[0] >= self.width or position[1] >= self.height or \
+                position[0] + width <= 0 or position[1] + height <= 0:
+            self.culled += 1
+            return
+
+        self.layers[layer].append((surface, position))
+
+    def submit_rotated(self, source: pygame.Surface, angle: float, center: tuple[float, float],
+                       layer: RenderLayer) -> None:
+        self.rotated.append((source, angle, center, layer))
+
+    def prepare(self) -> None:
+        # az összes látható elem forgatása egy lépésben, a szálkészlet ezeket párhuzamosan készíti el
+        prepared: dict[RotationKey, RotatedSurface] = RotationCache.prepare(
+            (source, angle, self.scale) for source, angle, _, _ in self.rotated
+        )
+        for source, angle, center, layer in self.rotated:
+            rotated, offset = prepared[RotationCache.key(source, angle, self.scale)]
+            self.submit(rotated, (center[0] * self.scale + offset[0], center[1] * self.scale + offset[1]), layer)
+        self.rotated.clear()
+
+    def flush(self) -> list[pygame.Rect]:
+        self.prepare()
+        rects: list[pygame.Rect] = []
+        drawn: int = 0
+        # rétegenként egyetlen blits hívás, alulról felfelé
+        for layer in sorted(self.layers, key=lambda layer: layer.value):
+            items: list[RenderItem] = self.layers[layer]
+            rects += self.screen.blits(items)  # type: ignore
+            drawn += len(items)
+            items.clear()
+
+        self.last_frame = {"submitted": self.submitted, "culled": self.culled, "drawn": drawn}
+        self.submitted = 0
+        self.culled = 0
+        return rects
+
+    def report(self) -> str:
+        return ", ".join(f"{name} {count}" for name, count in self.last_frame.items())
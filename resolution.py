@@ -0,0 +1,192 @@
+import math
+import weakref
+from fractions import Fraction
+
+import numpy as np
+import numpy.typing as npt
+import pygame
+
+from memory import SurfaceTracker
+
+
+class Resolution:
+    # a játék logikája mindig ebben a koordináta-rendszerben fut, a képernyő méretétől függetlenül
+    logical: tuple[int, int] = (1600, 900)
+    scale: float = 1  # a játéktér belső renderelési felbontása a logikaihoz képest
+    window: tuple[int, int] = logical
+    viewport: pygame.Rect = pygame.Rect((0, 0), logical)  # az ablak része, ahová a kép kerül
+    max_grid: int = 16  # forráspixel; a részleges nagyítás rácsa ennél durvább nem lehet
+    tile_size: int = 32  # forráspixel; ekkora csempékben gyűjtjük a részleges nagyítás területeit
+    max_rects: int = 96  # ennél több frissítendő téglalapnál a teljes kép nagyítása az olcsóbb
+
+    # forrás felület -> (arány, átméretezett felület); a forrás felszabadulásakor magától törlődik
+    scaled_surfaces: "weakref.WeakKeyDictionary[pygame.Surface, tuple[float, pygame.Surface]]" = \
+        weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def configure(scale: float | None = None, window: tuple[int, int] | None = None) -> None:
+        if scale is not None and scale != Resolution.scale:
+            Resolution.scale = scale
+            Resolution.scaled_surfaces.clear()
+        if window is not None:
+            Resolution.window = window
+            Resolution.viewport = Resolution.fit(window)
+
+    @staticmethod
+    def render_size(scale: float | None = None) -> tuple[int, int]:
+        scale = Resolution.scale if scale is None else scale
+        return round(Resolution.logical[0] * scale), round(Resolution.logical[1] * scale)
+
+    @staticmethod
+    def fit(window: tuple[int, int]) -> pygame.Rect:
+        # a képarányt megtartjuk, a maradék sáv fekete marad
+        ratio: float = min(window[0] / Resolution.logical[0], window[1] / Resolution.logical[1])
+        size: tuple[int, int] = (round(Resolution.logical[0] * ratio), round(Resolution.logical[1] * ratio))
+        return pygame.Rect((0, 0), size).move((window[0] - size[0]) // 2, (window[1] - size[1]) // 2)
+
+    @staticmethod
+    def scale_of(surface: pygame.Surface) -> float:
+        # a célfelület méretéből derül ki, milyen arányban kell rá rajzolni
+        return surface.get_width() / Resolution.logical[0]
+
+    @staticmethod
+    def point(position: tuple[float, float] | pygame.Vector2, scale: float) -> tuple[float, float]:
+        return position[0] * scale, position[1] * scale
+
+    @staticmethod
+    def rect(rect: pygame.Rect, scale: float) -> pygame.Rect:
+        # kifelé kerekítünk, hogy a terület biztosan lefedje, amit rajzoltunk
+        if scale == 1:
+            return rect.copy()
+        left: int = math.floor(rect.left * scale)
+        top: int = math.floor(rect.top * scale)
+        return pygame.Rect(left, top, math.ceil(rect.right * scale) - left, math.ceil(rect.bottom * scale) - top)
+
+    @staticmethod
+    def scaled(source: pygame.Surface, scale: float) -> pygame.Surface:
+        if scale == 1:
+            return source
+
+        entry: tuple[float, pygame.Surface] | None = Resolution.scaled_surfaces.get(source)
+        if entry is not None and entry[0] == scale:
+            return entry[1]
+
+        size: tuple[int, int] = (max(1, round(source.get_width() * scale)), max(1, round(source.get_height() * scale)))
+        scaled: pygame.Surface = pygame.transform.smoothscale(source, size) if source.get_bitsize() >= 24 \
+            else pygame.transform.scale(source, size)
+        scaled.set_alpha(source.get_alpha())
+        SurfaceTracker.track(scaled, "sprite", "Resolution.scaled")
+
+        Resolution.scaled_surfaces[source] = (scale, scaled)
+        return scaled
+
+    @staticmethod
+    def blit(screen: pygame.Surface, source: pygame.Surface, position: tuple[float, float]) -> pygame.Rect:
+        # logikai koordinátákban megadott rajzolás tetszőleges felbontású célra
+        scale: float = Resolution.scale_of(screen)
+        return screen.blit(Resolution.scaled(source, scale), Resolution.point(position, scale))
+
+    @staticmethod
+    def to_logical(position: tuple[int, int]) -> tuple[int, int]:
+        viewport: pygame.Rect = Resolution.viewport
+        return (round((position[0] - viewport.x) * Resolution.logical[0] / viewport.width),
+                round((position[1] - viewport.y) * Resolution.logical[1] / viewport.height))
+
+    @staticmethod
+    def mouse_pos() -> tuple[int, int]:
+        return Resolution.to_logical(pygame.mouse.get_pos())
+
+    @staticmethod
+    def present(frame: pygame.Surface, window: pygame.Surface) -> None:
+        # a kész képkockát egyetlen lépésben nagyítjuk az ablakra
+        if frame.get_size() == Resolution.viewport.size:
+            window.blit(frame, Resolution.viewport)
+        else:
+            pygame.transform.scale(frame, Resolution.viewport.size, window.subsurface(Resolution.viewport))
+
+    @staticmethod
+    def present_rects(frame: pygame.Surface, window: pygame.Surface, rects: list[pygame.Rect]) -> list[pygame.Rect]:
+        # csak a változott területeket nagyítjuk; a visszaadott téglalapok ablakkoordinátában vannak
+        viewport: pygame.Rect = Resolution.viewport
+        frame_rect: pygame.Rect = frame.get_rect()
+        # a forrást tengelyenként a nevező szerinti rácsra igazítjuk, annyi forráspixel pontosan egész számú
+        # ablakpixel; így a darabok ugyanazt adják, mint a teljes kép nagyítása, és nem látszik illesztés
+        ratio_x: Fraction = Fraction(viewport.width, frame_rect.width)
+        ratio_y: Fraction = Fraction(viewport.height, frame_rect.height)
+        if max(ratio_x.denominator, ratio_y.denominator) > Resolution.max_grid or len(rects) > Resolution.max_rects:
+            # ilyen durva rácson, vagy sok szétszórt darabnál (pl. a csillagok) a darabonkénti nagyítás többe kerül,
+            # mint az egész egyben; az ablakba ilyenkor is csak a változott területek kerülnek ki
+            Resolution.present(frame, window)
+            return Resolution.window_rects(frame_rect, rects)
+
+        px, qx = ratio_x.numerator, ratio_x.denominator
+        py, qy = ratio_y.numerator, ratio_y.denominator
+        updated: list[pygame.Rect] = []
+        target: pygame.Surface = window.subsurface(viewport)
+        for rect in Resolution.merge_rects(rects, (qx, qy), frame_rect.size):
+            source: pygame.Rect = rect.clip(frame_rect)
+            left: int = source.left * px // qx
+            top: int = source.top * py // qy
+            destination: pygame.Rect = pygame.Rect(left, top, -(-source.right * px // qx) - left,
+                                                   -(-source.bottom * py // qy) - top)
+            pygame.transform.scale(frame.subsurface(source), destination.size, target.subsurface(destination))
+            updated.append(destination.move(viewport.topleft))
+        return updated
+
+    @staticmethod
+    def window_rects(frame_rect: pygame.Rect, rects: list[pygame.Rect]) -> list[pygame.Rect]:
+        if not rects:
+            return []
+        viewport: pygame.Rect = Resolution.viewport
+        bounds: npt.NDArray[np.int64] = np.array([(rect.left, rect.top, rect.right, rect.bottom) for rect in rects])
+        scale: npt.NDArray[np.int64] = np.array(viewport.size * 2)
+        size: npt.NDArray[np.int64] = np.array(frame_rect.size * 2)
+        # a legközelebbi szomszéd nagyítás kerekítése miatt egy pixellel bővebben
+        low: npt.NDArray[np.int64] = np.maximum(bounds[:, :2] * scale[:2] // size[:2] - 1, 0)
+        high: npt.NDArray[np.int64] = np.minimum(-(-bounds[:, 2:] * scale[2:] // size[2:]) + 1, viewport.size)
+        lefts, tops = (low + viewport.topleft).T.tolist()
+        widths, heights = (high - low).T.tolist()
+        return [pygame.Rect(left, top, width, height)
+                for left, top, width, height in zip(lefts, tops, widths, heights) if width > 0 and height > 0]
+
+    @staticmethod
+    def merge_rects(rects: list[pygame.Rect], grid: tuple[int, int], size: tuple[int, int]) -> list[pygame.Rect]:
+        # a területeket a rácsra illeszkedő csempékre vetítjük, és soronként összefüggő csíkokat képzünk belőlük;
+        # így a sok apró (pl. csillag) téglalap és az egymást fedő előző/mostani helyek is kevés nagyításra esnek
+        tile_x: int = grid[0] * max(1, round(Resolution.tile_size / grid[0]))
+        tile_y: int = grid[1] * max(1, round(Resolution.tile_size / grid[1]))
+        columns: int = -(-size[0] // tile_x)
+        rows: int = -(-size[1] // tile_y)
+        covered: npt.NDArray[np.bool_] = np.zeros((rows, columns + 1), np.bool_)  # a plusz oszlop zárja a csíkokat
+        if not rects:
+            return []
+
+        bounds: npt.NDArray[np.int64] = np.array([(rect.left, rect.top, rect.right, rect.bottom) for rect in rects])
+        first_x: npt.NDArray[np.int64] = np.clip(bounds[:, 0] // tile_x, 0, columns - 1)
+        first_y: npt.NDArray[np.int64] = np.clip(bounds[:, 1] // tile_y, 0, rows - 1)
+        last_x: npt.NDArray[np.int64] = np.clip((bounds[:, 2] - 1) // tile_x, 0, columns - 1)
+        last_y: npt.NDArray[np.int64] = np.clip((bounds[:, 3] - 1) // tile_y, 0, rows - 1)
+        # a legfeljebb két csempényi téglalapok sarkai egyben, a nagyobbak egyenként
+        small: npt.NDArray[np.bool_] = (last_x - first_x <= 1) & (last_y - first_y <= 1)
+        for xs in (first_x[small], last_x[small]):
+            for ys in (first_y[small], last_y[small]):
+                covered[ys, xs] = True
+        for index in np.flatnonzero(~small).tolist():
+            covered[first_y[index]:last_y[index] + 1, first_x[index]:last_x[index] + 1] = True
+
+        merged: list[pygame.Rect] = []
+        # az előző sorban ugyanígy kezdődő és végződő csíkot lefelé hosszabbítjuk
+        open_runs: dict[tuple[int, int], pygame.Rect] = {}
+        for row in range(rows):
+            edges: list[int] = np.flatnonzero(np.diff(covered[row], prepend=False)).tolist()
+            runs: dict[tuple[int, int], pygame.Rect] = {}
+            for start, end in zip(edges[::2], edges[1::2]):
+                run: pygame.Rect | None = open_runs.get((start, end))
+                if run is None:
+                    run = pygame.Rect(start * tile_x, row * tile_y, (end - start) * tile_x, tile_y)
+                    merged.append(run)
+                else:
+                    run.height += tile_y
+                runs[(start, end)] = run
+            open_runs = runs
+        return merged
@@ -0,0 +1,137 @@
+import os
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from memory import SurfaceTracker
+from resolution import Resolution
+
+RotatedSurface = tuple[pygame.Surface, tuple[int, int]]  # elforgatott kép, bal felső sarok a középponthoz képest
+RotationKey = tuple[pygame.Surface, float, float]  # forrás kép, szög indexe (kikapcsolt cache-nél a szög), arány
+RotationRequest = tuple[pygame.Surface, float, float]  # forrás kép, szög, arány
+
+
+class RotationCache:
+    enabled: bool = True
+    step: float = 2  # fok
+    max_bytes: int = 128 * 2 ** 20
+    # a hiányzó forgatások szálkészleten készülnek; a pygame a transzformáció alatt elengedi a GIL-t
+    workers: int = min(4, os.cpu_count() or 1)
+    executor: ThreadPoolExecutor | None = None
+
+    # (forrás kép, szög indexe, renderelési arány) -> elforgatott kép; a forrás kép az Assets-ből jön,
+    # így a példányok osztoznak rajta
+    cache: "OrderedDict[RotationKey, RotatedSurface]" = OrderedDict()
+    size_bytes: int = 0
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @staticmethod
+    def configure(step: float | None = None, max_bytes: int | None = None, workers: int | None = None) -> None:
+        if step is not None and step != RotationCache.step:
+            RotationCache.step = step
+            RotationCache.clear()
+        if max_bytes is not None:
+            RotationCache.max_bytes = max_bytes
+            RotationCache.evict()
+        if workers is not None and workers != RotationCache.workers:
+            RotationCache.workers = max(1, workers)
+            if RotationCache.executor is not None:
+                RotationCache.executor.shutdown()
+                RotationCache.executor = None
+
+    @staticmethod
+    def clear() -> None:
+        RotationCache.cache.clear()
+        RotationCache.size_bytes = 0
+
+    @staticmethod
+    def key(source: pygame.Surface, angle: float, scale: float) -> RotationKey:
+        if not RotationCache.enabled:
+            return source, angle, scale
+        steps: int = round(360 / RotationCache.step)
+        return source, round(angle / RotationCache.step) % steps, scale
+
+    @staticmethod
+    def get(source: pygame.Surface, angle: float, scale: float = 1) -> RotatedSurface:
+        key: RotationKey = RotationCache.key(source, angle, scale)
+        if not RotationCache.enabled:
+            return RotationCache.rotate(Resolution.scaled(source, scale), angle, "RotationCache disabled")
+
+        entry: RotatedSurface | None = RotationCache.cache.get(key)
+        if entry is not None:
+            RotationCache.hits += 1
+            RotationCache.cache.move_to_end(key)
+            return entry
+
+        RotationCache.misses += 1
+        entry = RotationCache.rotate(Resolution.scaled(source, scale), key[1] * RotationCache.step)
+        RotationCache.store(key, entry)
+        return entry
+
+    @staticmethod
+    def prepare(requests: Iterable[RotationRequest]) -> dict[RotationKey, RotatedSurface]:
+        # a képkocka összes hiányzó forgatása egyszerre, hogy a szálak párhuzamosan dolgozhassanak rajtuk;
+        # a képkocka minden kért forgatását visszaadjuk, így a méretkorlát miatt rögtön kiürített elemet sem
+        # kell újra elkészíteni
+        prepared: dict[RotationKey, RotatedSurface] = {}
+        jobs: dict[RotationKey, tuple[pygame.Surface, float]] = {}
+        for source, angle, scale in requests:
+            key: RotationKey = RotationCache.key(source, angle, scale)
+            if key in prepared or key in jobs:
+                if RotationCache.enabled:
+                    RotationCache.hits += 1
+                continue
+            entry: RotatedSurface | None = RotationCache.cache.get(key)
+            if entry is not None:
+                RotationCache.hits += 1
+                RotationCache.cache.move_to_end(key)
+                prepared[key] = entry
+                continue
+            # az átméretezett forrás közös szótárban van, ezt még a fő szálon kérjük el
+            jobs[key] = (Resolution.scaled(source, scale),
+                         key[1] * RotationCache.step if RotationCache.enabled else angle)
+        if not jobs:
+            return prepared
+
+        results: Iterable[RotatedSurface]
+        if RotationCache.workers > 1 and len(jobs) > 1:
+            if RotationCache.executor is None:
+                RotationCache.executor = ThreadPoolExecutor(RotationCache.workers, "rotation")
+            results = RotationCache.executor.map(lambda job: RotationCache.rotate(*job), jobs.values())
+        else:
+            results = (RotationCache.rotate(*job) for job in jobs.values())
+
+        for key, entry in zip(jobs, results):
+            prepared[key] = entry
+            if RotationCache.enabled:
+                RotationCache.misses += 1
+                RotationCache.store(key, entry)
+            else:
+                SurfaceTracker.transient(entry[0], "RotationCache disabled")
+        return prepared
+
+    @staticmethod
+    def store(key: RotationKey, entry: RotatedSurface) -> None:
+        SurfaceTracker.track(entry[0], "sprite", "RotationCache")
+        RotationCache.cache[key] = entry
+        RotationCache.size_bytes += SurfaceTracker.byte_size(entry[0])
+        RotationCache.evict()
+
+    @staticmethod
+    def rotate(source: pygame.Surface, angle: float, transient_label: str | None = None) -> RotatedSurface:
+        rotated: pygame.Surface = pygame.transform.rotate(source, angle)
+        if transient_label is not None:
+            SurfaceTracker.transient(rotated, transient_label)
+        return rotated, (-(rotated.get_width() // 2), -(rotated.get_height() // 2))
+
+    @staticmethod
+    def evict() -> None:
+        while RotationCache.size_bytes > RotationCache.max_bytes and len(RotationCache.cache) > 1:
+            _, (rotated, _) = RotationCache.cache.popitem(last=False)
+            RotationCache.size_bytes -= SurfaceTracker.byte_size(rotated)
+            RotationCache.evictions += 1
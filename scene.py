@@ -0,0 +1,132 @@
+import os
+import sys
+import zlib
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Protocol
+
+from assets import Assets
+
+if sys.platform != "win32":  # Windowson nincs resource modul
+    import resource
+
+
+class Releasable(Protocol):
+    def release(self) -> None: ...
+
+    def render(self) -> None: ...
+
+
+class Scene:
+    def __init__(self, name: str, assets: list[Hashable],
+                 widgets: Callable[[], list[Releasable]] = lambda: []) -> None:
+        self.name: str = name
+        self.assets: list[Hashable] = assets
+        self.widgets: Callable[[], list[Releasable]] = widgets
+
+        self.peak_rss: int = 0
+
+    @property
+    def paths(self) -> set[str]:
+        return {key[1] for key in self.assets if isinstance(key, tuple)}  # type: ignore
+
+    def enter(self) -> None:
+        for key in self.assets:
+            Assets().load(key)
+
+    def exit(self, next_scene: "Scene", executor: ThreadPoolExecutor) -> None:
+        # ami a következő jelenetnek is kell, az maradjon betöltve; a tömörítés mellékszálon fut
+        Assets().demote_paths(self.paths - next_scene.paths, executor)
+
+        for widget in self.widgets():
+            widget.release()
+
+
+class SceneManager:
+    rss_sample_interval: int = 30  # képkockánként
+
+    def __init__(self, scenes: list[Scene], initial: str) -> None:
+        self.scenes: dict[str, Scene] = {scene.name: scene for scene in scenes}
+        self.current: Scene = self.scenes[initial]
+
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(1)
+        self.prefetching: dict[Future[bytes], Hashable] = {}
+        self.pending_widgets: list[Releasable] = []
+        self.prefetched: set[str] = set()
+        self.frame: int = 0
+
+        # az előtöltés mindent betöltött, ami nem a kezdő jelenethez tartozik, az rögtön félre kerül
+        others: set[str] = set().union(*(scene.paths for scene in scenes))
+        Assets().demote_paths(others - self.current.paths, self.executor)
+        self.current.enter()
+
+    def switch(self, name: str) -> None:
+        next_scene: Scene = self.scenes[name]
+        if next_scene is self.current:
+            return
+
+        self.sample_rss()
+        self.current.exit(next_scene, self.executor)
+        self.current = next_scene
+        self.current.enter()
+
+        self.prefetched.clear()
+        self.pending_widgets.clear()
+
+    def prefetch(self, name: str) -> None:
+        scene: Scene = self.scenes[name]
+        if scene is self.current or name in self.prefetched:
+            return
+        self.prefetched.add(name)
+
+        queued: set[Hashable] = set(self.prefetching.values())
+
+        for key in scene.assets:
+            if key in Assets().demoting:
+                # még tömörítés alatt áll, a felület él, visszatehető a cache-be
+                Assets().load(key)
+                continue
+            demoted = Assets().demoted.get(key)
+            if demoted is None or key in queued:
+                continue
+            # a kitömörítés mellékszálon fut, a konvertálás a fő szálon
+            self.prefetching[self.executor.submit(zlib.decompress, demoted[0])] = key
+
+        self.pending_widgets.extend(scene.widgets())
+
+    def update(self) -> None:
+        Assets().finish_demotions()
+        for future in [future for future in self.prefetching if future.done()]:
+            Assets().restore(self.prefetching.pop(future), future.result())
+
+        # képkockánként legfeljebb egy szöveg renderelése, hogy ne akadjon a játék
+        if self.pending_widgets:
+            self.pending_widgets.pop().render()
+
+        self.frame += 1
+        if self.frame % SceneManager.rss_sample_interval == 0:
+            self.sample_rss()
+
+    def sample_rss(self) -> None:
+        self.current.peak_rss = max(self.current.peak_rss, SceneManager.current_rss())
+
+    def report(self) -> str:
+        self.sample_rss()
+        return "\n".join(
+            f"{scene.name.ljust(12)}  peak RSS {scene.peak_rss / 2 ** 20:7.1f} MiB"
+            for scene in self.scenes.values()
+        )
+
+    @staticmethod
+    def current_rss() -> int:
+        # Windowson sem /proc, sem resource modul nincs
+        if sys.platform == "win32":
+            return 0
+        else:
+            try:
+                with open("/proc/self/statm", "r", encoding="utf-8") as file:
+                    return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+            except (OSError, ValueError, IndexError):
+                # /proc nélkül csak a folyamat eddigi csúcsa érhető el
+                peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                return peak if sys.platform == "darwin" else peak * 1024
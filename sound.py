@@ -1,12 +1,36 @@
+import io
+import threading
 from typing import List, Any
 
 import pygame
 
+from assetpack import AssetPack
+from assets import Assets
+from audiocache import AudioCache
+
+
+class LazySound:
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.sound: pygame.mixer.Sound | None = None
+
+    def get(self) -> pygame.mixer.Sound:
+        # csak az első lejátszáskor töltjük be (a dekódolt PCM cache-ből)
+        if self.sound is None:
+            Sound().init_mixer()
+            self.sound = Assets().sound(self.path)
+        return self.sound
+
+    def play(self) -> None:
+        self.get().play()
+
 
 class Sound(object):
     _instance: Any = None
     _initialized: bool = False
 
+    music_files: tuple[str, ...] = ("sound/menu_music.mp3", "sound/game_music.mp3")
+
     def __new__(cls, *args: Any, **kwargs: Any) -> "Sound":
         if cls._instance is None:
             cls._instance = super(Sound, cls).__new__(cls)
@@ -17,28 +41,26 @@ class Sound(object):
             return
         self._initialized = True
 
-        pygame.mixer.init()
         self.music_index: int = 0
-        self.game_music: str = "sound/game_music.mp3"
-        self.menu_music: str = "sound/menu_music.mp3"
+        self.menu_music: str = Sound.music_files[0]
+        self.game_music: str = Sound.music_files[1]
         self.all_music: List[str] = [self.menu_music, self.game_music]
-        pygame.mixer.music.load(self.all_music[self.music_index])
-
-        self.laser: pygame.mixer.Sound = pygame.mixer.Sound("sound/laser.mp3")
-        self.button: pygame.mixer.Sound = pygame.mixer.Sound("sound/button.mp3")
-        self.explosion: pygame.mixer.Sound = pygame.mixer.Sound("sound/explosion.mp3")
-        self.warning: pygame.mixer.Sound = pygame.mixer.Sound("sound/warning.mp3")
-        self.wrong_button: pygame.mixer.Sound = pygame.mixer.Sound(
-            "sound/wrong_button.mp3"
-        )
-        self.extend_arm: pygame.mixer.Sound = pygame.mixer.Sound("sound/extend_arm.mp3")
-        self.collect: pygame.mixer.Sound = pygame.mixer.Sound("sound/collect.mp3")
-        self.catch: pygame.mixer.Sound = pygame.mixer.Sound("sound/catch.mp3")
+        # packből betöltött zenénél a fájlobjektumnak élnie kell lejátszás közben
+        self.music_file: str | io.BytesIO = ""
+
+        self.laser: LazySound = LazySound("sound/laser.mp3")
+        self.button: LazySound = LazySound("sound/button.mp3")
+        self.explosion: LazySound = LazySound("sound/explosion.mp3")
+        self.warning: LazySound = LazySound("sound/warning.mp3")
+        self.wrong_button: LazySound = LazySound("sound/wrong_button.mp3")
+        self.extend_arm: LazySound = LazySound("sound/extend_arm.mp3")
+        self.collect: LazySound = LazySound("sound/collect.mp3")
+        self.catch: LazySound = LazySound("sound/catch.mp3")
 
         self.enabled: bool = True
         self._music_enabled: bool = True
 
-        self.all_sound: List[pygame.mixer.Sound] = [
+        self.all_sound: List[LazySound] = [
             self.laser,
             self.button,
             self.explosion,
@@ -62,12 +84,38 @@ class Sound(object):
         if self.music_index > 1:
             self.music_index = 0
 
+    def init_mixer(self) -> None:
+        if pygame.mixer.get_init() is not None:
+            return
+
+        pygame.mixer.init()
+        # a PCM cache előkészítése a háttérben, hogy az első lejátszás ne dekódoljon
+        threading.Thread(target=self.prepare_sounds, daemon=True).start()
+
+    def prepare_sounds(self) -> None:
+        pack: AssetPack | None = Assets().pack
+        for sound in self.all_sound:
+            if pack is not None and sound.path in pack:
+                continue
+            try:
+                AudioCache.prepare(sound.path)
+            except (pygame.error, OSError):
+                continue
+
+    def load_music(self) -> None:
+        self.init_mixer()
+        self.music_file = Assets().music(self.all_music[self.music_index])
+        pygame.mixer.music.load(self.music_file, "mp3")
+        self.controll_volume()
+
     def controll_volume(self) -> None:
+        if pygame.mixer.get_init() is None:
+            return
         if self._music_enabled:
             pygame.mixer.music.set_volume(0.3)
         else:
             pygame.mixer.music.set_volume(0)
 
-    def play_sound(self, sound: pygame.mixer.Sound) -> None:
+    def play_sound(self, sound: LazySound) -> None:
         if self.enabled:
             sound.play()
@@ -0,0 +1,105 @@
+import numpy as np
+import numpy.typing as npt
+import pygame
+
+from resolution import Resolution
+
+# csillagszám, mélység (a játékos sebességének hányadával mozog), fényesség, méret logikai pixelben
+StarLayer = tuple[int, float, int, int]
+
+
+class Starfield:
+    layers: tuple[StarLayer, ...] = ((220, 0.12, 90, 1), (110, 0.3, 160, 1), (45, 0.65, 235, 2))
+    drift: tuple[float, float] = (0, 0.25)  # állóhelyzetben is lassan úsznak a csillagok
+    max_step: int = 4  # csillagméretben; ennél nagyobb ugrás csak a képernyő szélén átfordulva lehet
+
+    def __init__(self, screen: pygame.Surface) -> None:
+        self.screen: pygame.Surface = screen
+        self.scale: float = Resolution.scale_of(screen)
+        self.width, self.height = screen.get_size()
+
+        # az alap háttér és a pixelei másolata; a csillagok régi helyét ebből állítjuk vissza
+        self.source: pygame.Surface | None = None
+        self.background: pygame.Surface | None = None
+        self.background_pixels: npt.NDArray[np.uint8] | None = None
+
+        random: np.random.Generator = np.random.default_rng()
+        count: int = sum(layer[0] for layer in Starfield.layers)
+        self.position: npt.NDArray[np.float32] = np.empty((count, 2), np.float32)
+        self.position[:, 0] = random.uniform(0, Resolution.logical[0], count)
+        self.position[:, 1] = random.uniform(0, Resolution.logical[1], count)
+
+        self.depth: npt.NDArray[np.float32] = np.repeat(
+            np.array([layer[1] for layer in Starfield.layers], np.float32), [layer[0] for layer in Starfield.layers]
+        )[:, None]
+        # rétegenként összefüggő szeletek, így a rajzolás rétegenként egy tömbművelet
+        self.slices: list[tuple[slice, int, int]] = []
+        start: int = 0
+        for layer_count, _, brightness, size in Starfield.layers:
+            self.slices.append((slice(start, start + layer_count), brightness, max(1, round(size * self.scale))))
+            start += layer_count
+
+        # az előző képkockán kirajzolt csillagok bal felső pixelei
+        self.drawn: npt.NDArray[np.intp] | None = None
+
+    def base(self, source: pygame.Surface) -> pygame.Surface:
+        if source is not self.source or self.background is None:
+            self.source = source
+            self.background = Resolution.scaled(source, self.scale)
+            self.background_pixels = pygame.surfarray.array3d(self.background)
+            self.drawn = None
+        return self.background
+
+    def render(self) -> None:
+        # az alap háttér a jelenet első képkockáján, a base()-ben készül el, addigra a forrása is betöltődik
+        pass
+
+    def release(self) -> None:
+        # a méretezett háttér és a pixelmásolata a játékon kívül csak a memóriát foglalná
+        self.source = None
+        self.background = None
+        self.background_pixels = None
+        self.drawn = None
+
+    def update(self, velocity: pygame.Vector2) -> None:
+        # a játékos a sebességével ellentétesen mozog, a csillagok ezért vele egy irányba tolódnak
+        self.position += (np.array((velocity.x, velocity.y), np.float32) + Starfield.drift) * self.depth
+        self.position %= np.array(Resolution.logical, np.float32)
+
+    def draw(self, screen: pygame.Surface) -> list[pygame.Rect]:
+        assert self.background_pixels is not None
+        size: int = self.slices[-1][2]
+        xs: npt.NDArray[np.intp] = np.minimum((self.position[:, 0] * self.scale).astype(np.intp), self.width - size)
+        ys: npt.NDArray[np.intp] = np.minimum((self.position[:, 1] * self.scale).astype(np.intp), self.height - size)
+
+        pixels: npt.NDArray[np.uint8] = pygame.surfarray.pixels3d(screen)
+        if self.drawn is not None:
+            for stars, _, star_size in self.slices:
+                old_xs, old_ys = self.drawn[0, stars], self.drawn[1, stars]
+                for dx in range(star_size):
+                    for dy in range(star_size):
+                        pixels[old_xs + dx, old_ys + dy] = self.background_pixels[old_xs + dx, old_ys + dy]
+
+        for stars, brightness, star_size in self.slices:
+            for dx in range(star_size):
+                for dy in range(star_size):
+                    pixels[xs[stars] + dx, ys[stars] + dy] = brightness
+        # a felület zárolása a tömb felszabadításáig tart
+        del pixels
+
+        current: npt.NDArray[np.intp] = np.stack((xs, ys))
+        previous: npt.NDArray[np.intp] = current if self.drawn is None else self.drawn
+        self.drawn = current
+
+        # csillagonként a régi és az új helyet egy téglalap fedi le, a szélen átforduló csillagnál kettő
+        wrapped: npt.NDArray[np.bool_] = (np.abs(current - previous) > Starfield.max_step * size).any(axis=0)
+        moved: npt.NDArray[np.intp] = np.concatenate((previous, current[:, wrapped]), axis=1)
+        reached: npt.NDArray[np.intp] = np.concatenate(
+            (np.where(wrapped, previous, current), current[:, wrapped]), axis=1
+        )
+        lefts: list[int] = np.minimum(moved[0], reached[0]).tolist()
+        tops: list[int] = np.minimum(moved[1], reached[1]).tolist()
+        widths: list[int] = (np.abs(moved[0] - reached[0]) + size).tolist()
+        heights: list[int] = (np.abs(moved[1] - reached[1]) + size).tolist()
+        return [pygame.Rect(left, top, width, height)
+                for left, top, width, height in zip(lefts, tops, widths, heights)]
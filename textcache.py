@@ -0,0 +1,53 @@
+from collections import OrderedDict
+
+import pygame
+
+from memory import SurfaceTracker
+
+TextKey = tuple[pygame.font.Font, str, tuple[int, int, int, int], bool]
+
+
+class TextCache:
+    max_bytes: int = 8 * 2 ** 20
+
+    # (betűtípus, szöveg, szín, élsimítás) -> kész felirat; a betűtípus az Assets-ből jön, így a példányok osztoznak rajta
+    cache: "OrderedDict[TextKey, pygame.Surface]" = OrderedDict()
+    size_bytes: int = 0
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @staticmethod
+    def render(font: pygame.font.Font, text: str, color: tuple[int, int, int] | str,
+               antialias: bool = True) -> pygame.Surface:
+        # a pygame.Color nem hash-elhető, a név és a tuple ugyanarra a kulcsra képződik le
+        rgba: pygame.Color = pygame.Color(color)
+        key: TextKey = (font, text, (rgba.r, rgba.g, rgba.b, rgba.a), antialias)
+
+        surface: pygame.Surface | None = TextCache.cache.get(key)
+        if surface is not None:
+            TextCache.hits += 1
+            TextCache.cache.move_to_end(key)
+            return surface
+
+        TextCache.misses += 1
+        surface = SurfaceTracker.track(font.render(text, antialias, color), "text", "TextCache")
+
+        TextCache.cache[key] = surface
+        TextCache.size_bytes += SurfaceTracker.byte_size(surface)
+        TextCache.evict()
+
+        return surface
+
+    @staticmethod
+    def clear() -> None:
+        TextCache.cache.clear()
+        TextCache.size_bytes = 0
+
+    @staticmethod
+    def evict() -> None:
+        while TextCache.size_bytes > TextCache.max_bytes and len(TextCache.cache) > 1:
+            _, surface = TextCache.cache.popitem(last=False)
+            TextCache.size_bytes -= SurfaceTracker.byte_size(surface)
+            TextCache.evictions += 1
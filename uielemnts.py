@@ -1,9 +1,13 @@
 import typing
 
-from collections.abc import Callable
+from collections.abc import Callable, Hashable
 import pygame
 
+from assets import Assets
+from memory import SurfaceTracker
+from resolution import Resolution
 from sound import Sound
+from textcache import TextCache
 
 
 class Button:
@@ -22,14 +26,20 @@ class Button:
         disabled_color: tuple[int, int, int] | str = "gray",
         **position: tuple[int, int],
     ) -> None:
-        self.surface: pygame.Surface = pygame.Surface(
-            size, pygame.SRCALPHA, 32
-        ).convert_alpha()
-        self.rect: pygame.Rect = self.surface.get_rect(**position)
-        self.text: pygame.Surface = font.render(text, True, font_color)
-        self.text_rect: pygame.Rect = self.text.get_rect(
-            center=(self.surface.get_width() / 2, self.surface.get_height() / 2)
-        )
+        self.size: tuple[int, int] = size
+        self.label: str = text
+        self.font: pygame.font.Font = font
+        self.font_color: tuple[int, int, int] | str = font_color
+
+        self.rect: pygame.Rect = pygame.Rect((0, 0), size)
+        for anchor, value in position.items():
+            setattr(self.rect, anchor, value)
+        # a felületek a jelenetváltáskor eldobhatók, rajzoláskor újra elkészülnek
+        self.surface: pygame.Surface | None = None
+        self.text: pygame.Surface | None = None
+        self.text_rect: pygame.Rect = pygame.Rect(0, 0, 0, 0)
+        # a legutóbb kitöltött háttérszín, csak ennek változásakor kell újra kitölteni
+        self.fill_color: tuple[int, int, int] | str | None = None
 
         self.bg_color: tuple[int, int, int] | str | None = bg_color
         self.disabled_color: tuple[int, int, int] | str = disabled_color
@@ -43,14 +53,40 @@ class Button:
 
         self.sound = Sound()
 
-    def draw(self, screen: pygame.Surface) -> None:
-        if self.bg_color is not None:
-            self.surface.fill(
-                self.bg_color
-                if (self.usage != 0 and self.active())
-                else self.disabled_color
-            )
+    def render(self) -> None:
+        self.surface = SurfaceTracker.track(pygame.Surface(self.size, pygame.SRCALPHA, 32).convert_alpha(),
+                                            "ui", f"Button:{self.label}")
+        self.text = SurfaceTracker.track(self.font.render(self.label, True, self.font_color),
+                                         "text", f"Button:{self.label}")
+        self.text_rect = self.text.get_rect(
+            center=(self.surface.get_width() / 2, self.surface.get_height() / 2)
+        )
+        self.compose(self.state())
+
+    def release(self) -> None:
+        self.surface = None
+        self.text = None
+
+    def state(self) -> tuple[int, int, int] | str | None:
+        if self.bg_color is None:
+            return None
+        return self.bg_color if (self.usage != 0 and self.active()) else self.disabled_color
+
+    def compose(self, fill_color: tuple[int, int, int] | str | None) -> None:
+        assert self.surface is not None and self.text is not None
+
+        self.surface.fill(fill_color if fill_color is not None else (0, 0, 0, 0))
         self.surface.blit(self.text, self.text_rect)
+        self.fill_color = fill_color
+
+    def draw(self, screen: pygame.Surface) -> None:
+        if self.surface is None or self.text is None:
+            self.render()
+        assert self.surface is not None
+
+        fill_color: tuple[int, int, int] | str | None = self.state()
+        if fill_color != self.fill_color:
+            self.compose(fill_color)
         screen.blit(self.surface, self.rect)
 
     def click(self) -> typing.Any:
@@ -65,7 +101,7 @@ class Button:
 
     @staticmethod
     def handle_clicks() -> None:
-        mouse_pos: tuple[int, int] = pygame.mouse.get_pos()
+        mouse_pos: tuple[int, int] = Resolution.mouse_pos()
         for button in Button.buttons:
             if button.rect.collidepoint(mouse_pos):
                 button.click()
@@ -82,14 +118,19 @@ class Image:
         size: tuple[int, int] | float | None = None,
         **position: tuple[int, int],
     ) -> None:
-        self.surface: pygame.Surface = pygame.image.load(path).convert_alpha()
+        # csak a cache kulcsát tartjuk meg, így a kép a jelenettel együtt félretehető
+        self.key: tuple[typing.Any, ...] = ("image", Assets.normalize(path), True)
         if size:
             if isinstance(size, tuple):
-                self.surface = pygame.transform.scale(self.surface, size)
+                self.key = ("scaled", Assets.normalize(path), size, True)
             elif isinstance(size, float):
-                self.surface = pygame.transform.scale_by(self.surface, (size, size))
+                self.key = ("scaled_by", Assets.normalize(path), size, True)
         self.rect: pygame.Rect = self.surface.get_rect(**position)
 
+    @property
+    def surface(self) -> pygame.Surface:
+        return Assets().load(self.key)  # type: ignore
+
     def draw(self, screen: pygame.Surface) -> None:
         screen.blit(self.surface, self.rect)
 
@@ -97,22 +138,38 @@ class Image:
 class Text:
     def __init__(self, text: str, font: pygame.font.Font, color: tuple[int, int, int] | str,
                  line_height: int = 30, **position: tuple[int, int]) -> None:
-        lines: list[str] = text.split("\n")
-        self.surfaces: list[pygame.Surface] = []
+        self.lines: list[str] = text.split("\n")
+        self.font: pygame.font.Font = font
+        self.color: tuple[int, int, int] | str = color
+        self.surfaces: list[pygame.Surface] | None = None
+        self.rects: list[pygame.Rect] = []
         self.line_height: int = line_height
 
         self.position: dict[str, tuple[int, int]] = position
         self.position_anchor: str = list(self.position.keys())[0]
 
-        for line in lines:
-            self.surfaces.append(font.render(line, True, color))
+    def render(self) -> None:
+        self.surfaces = [SurfaceTracker.track(self.font.render(line, True, self.color), "text", f"Text:{self.lines[0]}")
+                         for line in self.lines]
 
-    def draw(self, screen: pygame.Surface) -> None:
-        for index, surface in enumerate(self.surfaces):
-            position: tuple[int, int] = self.position[self.position_anchor]
-            position = (position[0], position[1] + (self.line_height * index))
-            rect = surface.get_rect(**{self.position_anchor: position})
-            screen.blit(surface, rect)
+        # a sorok helye nem változik, elég a rendereléskor egyszer kiszámolni
+        anchor: tuple[int, int] = self.position[self.position_anchor]
+        self.rects = [
+            surface.get_rect(**{self.position_anchor: (anchor[0], anchor[1] + self.line_height * index)})
+            for index, surface in enumerate(self.surfaces)
+        ]
+
+    def release(self) -> None:
+        self.surfaces = None
+
+    def draw(self, screen: pygame.Surface) -> list[pygame.Rect]:
+        if self.surfaces is None:
+            self.render()
+        assert self.surfaces is not None
+
+        scale: float = Resolution.scale_of(screen)
+        return [screen.blit(Resolution.scaled(surface, scale), Resolution.point(rect.topleft, scale))
+                for surface, rect in zip(self.surfaces, self.rects)]
 
 
 class Counter:
@@ -130,16 +187,39 @@ class Counter:
         self.color: tuple[int, int, int] | str = color
         self.position: dict[str, tuple[int, int]] = position
 
-        self.surface: pygame.Surface = font.render(str(self.count), True, color)
-        self.rect: pygame.Rect = self.surface.get_rect(**position)
+        # a felirat a cache-elt előtagból és számjegyenként cache-elt karakterekből áll össze,
+        # így a gyorsan változó pontszám sem hívja a betűtípus raszterizálóját
+        self.label: str = ""
+        self.glyphs: list[pygame.Surface] = []
+        self.rect: pygame.Rect = pygame.Rect(0, 0, 0, 0)
+        self.layout(str(self.count))
 
     def update(self, count: float) -> None:
         self.count = count
-        self.surface = self.font.render(self.text + str(self.count), True, self.color)
-        self.rect = self.surface.get_rect(**self.position)
-
-    def draw(self, screen: pygame.Surface) -> None:
-        screen.blit(self.surface, self.rect)
+        label: str = self.text + str(self.count)
+        # csak változáskor rakjuk össze újra
+        if label != self.label:
+            self.layout(label)
+
+    def layout(self, label: str) -> None:
+        self.label = label
+        prefix: str = self.text if label.startswith(self.text) else ""
+        self.glyphs = [TextCache.render(self.font, prefix, self.color)] if prefix else []
+        self.glyphs += [TextCache.render(self.font, character, self.color) for character in label[len(prefix):]]
+
+        width: int = sum(glyph.get_width() for glyph in self.glyphs)
+        height: int = max((glyph.get_height() for glyph in self.glyphs), default=self.font.get_height())
+        self.rect = pygame.Rect(0, 0, width, height)
+        for anchor, value in self.position.items():
+            setattr(self.rect, anchor, value)
+
+    def draw(self, screen: pygame.Surface) -> pygame.Rect:
+        scale: float = Resolution.scale_of(screen)
+        x: int = self.rect.x
+        for glyph in self.glyphs:
+            screen.blit(Resolution.scaled(glyph, scale), Resolution.point((x, self.rect.y), scale))
+            x += glyph.get_width()
+        return Resolution.rect(self.rect, scale)
 
 
 class UpgradeCard:
@@ -148,7 +228,8 @@ class UpgradeCard:
                  function: Callable[[], typing.Any], active: Callable[[], bool], description: str,
                  description_font: pygame.font.Font, disabled_color: tuple[int, int, int] | str = "gray",
                  **position: tuple[int, int]) -> None:
-        self.surface: pygame.Surface = pygame.Surface(size, pygame.SRCALPHA, 32).convert_alpha()
+        self.surface: pygame.Surface = SurfaceTracker.track(pygame.Surface(size, pygame.SRCALPHA, 32).convert_alpha(),
+                                                            "ui", f"UpgradeCard:{text}")
 
         converted_position: tuple[int, int] = position.get("center", (0, 0))
 
@@ -167,5 +248,16 @@ class UpgradeCard:
         self.description.draw(screen)
         self.button.draw(screen)
 
+    def state(self) -> Hashable:
+        return self.button.state()
+
+    def render(self) -> None:
+        for widget in (self.name, self.price_text, self.description, self.button):
+            widget.render()
+
+    def release(self) -> None:
+        for widget in (self.name, self.price_text, self.description, self.button):
+            widget.release()
+
     def remove(self) -> None:
         Button.delete_button(self.button)
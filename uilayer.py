@@ -0,0 +1,58 @@
+from collections.abc import Callable, Hashable
+
+import pygame
+
+from memory import SurfaceTracker
+from resolution import Resolution
+
+
+class UILayer:
+    def __init__(self, name: str, compose: Callable[[pygame.Surface], None], state: Callable[[], Hashable]) -> None:
+        self.name: str = name
+        self.compose: Callable[[pygame.Surface], None] = compose
+        # minden, ami a képet befolyásolja; ha nem változik, a kész felület újra felhasználható
+        self.state: Callable[[], Hashable] = state
+
+        # a menük logikai felbontásban készülnek, az ablakhoz csak összerakás után méretezzük őket
+        self.canvas: pygame.Surface | None = None
+        self.surface: pygame.Surface | None = None
+        self.composed_state: Hashable = None
+        self.dirty: bool = True
+
+        self.composes: int = 0
+
+    def render(self) -> None:
+        if self.canvas is None:
+            self.canvas = SurfaceTracker.track(pygame.Surface(Resolution.logical).convert(), "ui",
+                                               f"UILayer:{self.name}")
+            self.dirty = True
+
+    def release(self) -> None:
+        self.canvas = None
+        self.surface = None
+
+    def invalidate(self) -> None:
+        self.dirty = True
+
+    def changed(self) -> bool:
+        return self.dirty or self.surface is None or self.state() != self.composed_state
+
+    def draw(self, screen: pygame.Surface) -> pygame.Rect:
+        self.render()
+        assert self.canvas is not None
+
+        state: Hashable = self.state()
+        if self.dirty or state != self.composed_state or self.surface is None:
+            self.compose(self.canvas)
+            self.composed_state = state
+            self.dirty = False
+            self.composes += 1
+
+            viewport: pygame.Rect = Resolution.viewport
+            if viewport.size == self.canvas.get_size():
+                self.surface = self.canvas
+            else:
+                self.surface = SurfaceTracker.track(pygame.transform.smoothscale(self.canvas, viewport.size), "ui",
+                                                    f"UILayer:{self.name}")
+
+        return screen.blit(self.surface, Resolution.viewport)